@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import os
+import re
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
-from fnmatch import fnmatch
+from fnmatch import translate
 
 from argus_agent.tools.base import ToolRisk
 
@@ -70,6 +73,9 @@ _BLOCKLIST_PATTERNS: list[str] = [
     "update-grub*",
 ]
 
+# All blocklist globs folded into one anchored alternation, matched in a single call
+_BLOCKLIST_RE = re.compile("|".join(f"(?:{translate(p)})" for p in _BLOCKLIST_PATTERNS))
+
 
 def _is_blocked(cmd_str: str) -> bool:
     """Return True if the command is blocked."""
@@ -85,11 +91,7 @@ def _is_blocked(cmd_str: str) -> bool:
                 return True
 
     # Check glob patterns
-    for pattern in _BLOCKLIST_PATTERNS:
-        if fnmatch(cmd_str, pattern):
-            return True
-
-    return False
+    return _BLOCKLIST_RE.match(cmd_str) is not None
 
 # Risk classification: glob pattern → risk level.
 # Commands matching these patterns get the specified risk level.
@@ -184,6 +186,32 @@ RISK_PATTERNS: dict[str, ToolRisk] = {
 # Default risk for commands not matching any pattern (requires user approval)
 DEFAULT_RISK = ToolRisk.MEDIUM
 
+# (position in the pattern dict, compiled glob matcher, risk)
+_RiskEntry = tuple[int, Callable[[str], re.Match[str] | None], ToolRisk]
+
+
+def _index_risk_patterns(
+    patterns: dict[str, ToolRisk],
+) -> tuple[dict[str, list[_RiskEntry]], list[_RiskEntry]]:
+    """Bucket risk patterns by their literal first word.
+
+    A pattern like ``"docker ps*"`` can only match commands whose first word
+    is ``docker``, so it is filed under that word. Patterns whose first word
+    contains a wildcard (``"lsblk*"``) go into a catch-all list that is tried
+    for every command. Entries keep their dict position so the first
+    matching pattern still wins.
+    """
+    by_word: dict[str, list[_RiskEntry]] = {}
+    wildcard: list[_RiskEntry] = []
+    for pos, (pattern, risk) in enumerate(patterns.items()):
+        entry = (pos, re.compile(translate(pattern)).match, risk)
+        word = pattern.split(" ", 1)[0]
+        if any(c in word for c in "*?["):
+            wildcard.append(entry)
+        else:
+            by_word.setdefault(word, []).append(entry)
+    return by_word, wildcard
+
 
 class CommandSandbox:
     """Execute commands safely with blocklist validation.
@@ -198,6 +226,7 @@ class CommandSandbox:
         risk_patterns: dict[str, ToolRisk] | None = None,
     ) -> None:
         self._risk_patterns = risk_patterns if risk_patterns is not None else RISK_PATTERNS
+        self._risk_by_word, self._risk_wildcard = _index_risk_patterns(self._risk_patterns)
 
     def validate_command(self, cmd: list[str]) -> tuple[bool, ToolRisk]:
         """Check if a command is allowed and return its risk level.
@@ -213,9 +242,12 @@ class CommandSandbox:
             logger.warning("Blocked command (blocklist): %s", cmd_str)
             return False, ToolRisk.CRITICAL
 
-        # Classify risk level from known patterns
-        for pattern, risk in self._risk_patterns.items():
-            if fnmatch(cmd_str, pattern):
+        # Classify risk level from the patterns that can match the first word
+        candidates = heapq.merge(
+            self._risk_by_word.get(cmd_str.split(" ", 1)[0], ()), self._risk_wildcard,
+        )
+        for _pos, match, risk in candidates:
+            if match(cmd_str):
                 return True, risk
 
         # Not in blocklist, not in known patterns → allow with default risk
@@ -5,6 +5,10 @@ from __future__ import annotations
 import json
 import logging
 import uuid
+from bisect import bisect_left
+from itertools import accumulate
+
+import orjson
 
 from argus_agent.llm.base import LLMMessage
 from argus_agent.storage.models import Conversation, Message
@@ -174,7 +178,7 @@ class ConversationMemory:
             for i in range(cutoff):
                 if result[i].role == "tool" and len(result[i].content) > 200:
                     try:
-                        data = json.loads(result[i].content)
+                        data = orjson.loads(result[i].content)
                         summary = _summarize_tool_result(data)
                         result[i] = LLMMessage(
                             role="tool",
@@ -182,14 +186,18 @@ class ConversationMemory:
                             tool_call_id=result[i].tool_call_id,
                             name=result[i].name,
                         )
-                    except (json.JSONDecodeError, TypeError):
+                    except (orjson.JSONDecodeError, TypeError):
                         pass
 
-        # Estimate token usage and drop oldest if over budget
-        total_tokens = sum(_estimate_tokens(m) for m in result)
-        while total_tokens > MAX_HISTORY_TOKENS and len(result) > 2:
-            dropped = result.pop(0)
-            total_tokens -= _estimate_tokens(dropped)
+        # Estimate token usage and drop oldest if over budget.  The prefix
+        # sums let us find how many messages to drop with one bisect and a
+        # single slice instead of popping from the front one at a time.
+        cumulative = list(accumulate(_estimate_tokens(m) for m in result))
+        excess = cumulative[-1] - MAX_HISTORY_TOKENS
+        if excess > 0:
+            drop = min(bisect_left(cumulative, excess) + 1, len(result) - 2)
+            if drop > 0:
+                result = result[drop:]
 
         # Remove orphaned tool results whose assistant message was
         # truncated above.  A tool result is valid only if its
@@ -214,17 +222,24 @@ class ConversationMemory:
 
 
 def _estimate_tokens(msg: LLMMessage) -> int:
-    """Rough token estimate for a message."""
-    text = msg.content
-    if msg.tool_calls:
-        text += json.dumps(msg.tool_calls)
-    return len(text) // 4 + 4  # ~4 chars per token + message overhead
+    """Rough token estimate for a message, cached on the message."""
+    if msg._token_estimate is None:
+        text = msg.content
+        if msg.tool_calls:
+            text += json.dumps(msg.tool_calls)
+        msg._token_estimate = len(text) // 4 + 4  # ~4 chars per token + message overhead
+    return msg._token_estimate
+
+
+def _dumps(obj: dict) -> str:
+    """Serialize a JSON-compatible dict to compact text via orjson."""
+    return orjson.dumps(obj).decode()
 
 
 def _summarize_tool_result(data: dict) -> str:
     """Create a compact summary of a tool result."""
     if "error" in data:
-        return json.dumps({"error": data["error"]})
+        return _dumps({"error": data["error"]})
 
     summary: dict = {}
     # Keep key metadata, drop large content
@@ -248,4 +263,4 @@ def _summarize_tool_result(data: dict) -> str:
         else:
             summary["content"] = content
 
-    return json.dumps(summary) if summary else json.dumps({"status": "ok"})
+    return _dumps(summary) if summary else _dumps({"status": "ok"})
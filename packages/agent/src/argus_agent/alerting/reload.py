@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
 
@@ -19,6 +20,10 @@ logger = logging.getLogger("argus.alerting.reload")
 _last_reload_time: float = 0.0
 _RELOAD_CACHE_SECONDS = 60.0
 
+# Forced reload not yet reading config; concurrent forced callers (API saves)
+# join it. Tasks are loop-bound, so one left over from another loop is ignored
+_pending_reload: asyncio.Task[None] | None = None
+
 
 async def reload_channels(*, force: bool = False) -> None:
     """Read enabled channel configs from DB and update the running AlertEngine.
@@ -26,14 +31,39 @@ async def reload_channels(*, force: bool = False) -> None:
     WebSocketChannel goes to the engine (immediate, unfiltered).
     External channels (Slack, Email, Webhook) go to the formatter (severity-routed).
     Cached for 60s to avoid repeated DB reads on every alert; pass force=True to bypass.
+    Forced calls made in the same event-loop tick share a single reload.
     """
-    global _last_reload_time
+    global _last_reload_time, _pending_reload
 
     now = time.monotonic()
-    if not force and (now - _last_reload_time) < _RELOAD_CACHE_SECONDS:
+    if not force:
+        # The cache already lets only one caller per window through
+        if (now - _last_reload_time) < _RELOAD_CACHE_SECONDS:
+            return
+        _last_reload_time = now
+        await _reload_now()
         return
     _last_reload_time = now
 
+    task = _pending_reload
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = _pending_reload = asyncio.create_task(_coalesced_reload())
+    # Shielded so one cancelled caller does not cancel the reload for the others
+    await asyncio.shield(task)
+
+
+async def _coalesced_reload() -> None:
+    global _pending_reload
+
+    # Yield once so forced callers from the same tick can join
+    await asyncio.sleep(0)
+    # Callers from here on schedule a fresh reload so they see any newer config
+    if _pending_reload is asyncio.current_task():
+        _pending_reload = None
+    await _reload_now()
+
+
+async def _reload_now() -> None:
     from argus_agent.api.ws import manager
     from argus_agent.main import _get_alert_engine, _get_alert_formatter, _get_distributed_manager
 
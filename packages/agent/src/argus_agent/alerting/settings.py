@@ -5,9 +5,12 @@ from __future__ import annotations
 import copy
 import logging
 import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from argus_agent.config import AlertConfig
 from argus_agent.storage.models import NotificationChannelConfig
@@ -23,6 +26,26 @@ _MASK = "••••••••"
 class NotificationSettingsService:
     """Read/write notification channel configs in the DB."""
 
+    def __init__(self) -> None:
+        self._session: AsyncSession | None = None
+
+    @asynccontextmanager
+    async def transactional(self) -> AsyncIterator[None]:
+        """Run several calls on this service in one session with a single commit.
+
+        Nested blocks join the outer one, which keeps the session and commits.
+        """
+        if self._session is not None:
+            yield
+            return
+        async with get_session() as session:
+            self._session = session
+            try:
+                yield
+                await session.commit()
+            finally:
+                self._session = None
+
     async def get_all(self) -> list[dict[str, Any]]:
         """Return all channel configs with secrets masked."""
         rows = await self._fetch_all()
@@ -34,7 +57,7 @@ class NotificationSettingsService:
 
     async def get_by_type(self, channel_type: str) -> dict[str, Any] | None:
         """Return a single channel config by type, secrets masked."""
-        async with get_session() as session:
+        async with self._session_scope() as session:
             stmt = select(NotificationChannelConfig).where(
                 NotificationChannelConfig.channel_type == channel_type,
             )
@@ -46,7 +69,7 @@ class NotificationSettingsService:
 
     async def get_by_type_raw(self, channel_type: str) -> dict[str, Any] | None:
         """Return a single channel config by type, with full secrets."""
-        async with get_session() as session:
+        async with self._session_scope() as session:
             stmt = select(NotificationChannelConfig).where(
                 NotificationChannelConfig.channel_type == channel_type,
             )
@@ -63,7 +86,7 @@ class NotificationSettingsService:
         config: dict[str, Any],
     ) -> dict[str, Any]:
         """Create or update a channel config. Returns the masked result."""
-        async with get_session() as session:
+        async with self._session_scope(write=True) as session:
             stmt = select(NotificationChannelConfig).where(
                 NotificationChannelConfig.channel_type == channel_type,
             )
@@ -87,13 +110,21 @@ class NotificationSettingsService:
                 row.enabled = enabled
                 row.config = merged
 
-            await session.commit()
+            await session.flush()
             await session.refresh(row)
             return self._mask(self._row_to_dict(row))
 
+    async def upsert_many(
+        self,
+        rows: list[tuple[str, bool, dict[str, Any]]],
+    ) -> list[dict[str, Any]]:
+        """Upsert several ``(channel_type, enabled, config)`` rows with a single commit."""
+        async with self.transactional():
+            return [await self.upsert(*row) for row in rows]
+
     async def delete(self, channel_type: str) -> bool:
         """Delete a channel config. Returns True if something was deleted."""
-        async with get_session() as session:
+        async with self._session_scope(write=True) as session:
             stmt = select(NotificationChannelConfig).where(
                 NotificationChannelConfig.channel_type == channel_type,
             )
@@ -102,37 +133,52 @@ class NotificationSettingsService:
             if row is None:
                 return False
             await session.delete(row)
-            await session.commit()
+            await session.flush()
             return True
 
     async def initialize_from_config(self, alert_config: AlertConfig) -> None:
         """Seed DB from YAML/env config on first run (skip if rows exist)."""
-        # Webhook
-        if alert_config.webhook_urls:
-            existing = await self.get_by_type_raw("webhook")
-            if existing is None:
-                await self.upsert("webhook", True, {"urls": alert_config.webhook_urls})
-                logger.info("Seeded webhook config from static config")
-
-        # Email
-        if alert_config.email_enabled:
-            existing = await self.get_by_type_raw("email")
-            if existing is None:
-                await self.upsert("email", True, {
-                    "smtp_host": alert_config.email_smtp_host,
-                    "smtp_port": alert_config.email_smtp_port,
-                    "from_addr": alert_config.email_from,
-                    "to_addrs": alert_config.email_to,
-                    "smtp_user": "",
-                    "smtp_password": "",
-                    "use_tls": True,
-                })
-                logger.info("Seeded email config from static config")
+        async with self.transactional():
+            # Webhook
+            if alert_config.webhook_urls:
+                existing = await self.get_by_type_raw("webhook")
+                if existing is None:
+                    await self.upsert("webhook", True, {"urls": alert_config.webhook_urls})
+                    logger.info("Seeded webhook config from static config")
+
+            # Email
+            if alert_config.email_enabled:
+                existing = await self.get_by_type_raw("email")
+                if existing is None:
+                    await self.upsert("email", True, {
+                        "smtp_host": alert_config.email_smtp_host,
+                        "smtp_port": alert_config.email_smtp_port,
+                        "from_addr": alert_config.email_from,
+                        "to_addrs": alert_config.email_to,
+                        "smtp_user": "",
+                        "smtp_password": "",
+                        "use_tls": True,
+                    })
+                    logger.info("Seeded email config from static config")
 
     # ---- internal helpers ----
 
-    async def _fetch_all(self) -> list[dict[str, Any]]:
+    @asynccontextmanager
+    async def _session_scope(self, write: bool = False) -> AsyncIterator[AsyncSession]:
+        """Yield the active transactional session, or a fresh one.
+
+        A fresh session is committed on exit only for *write* scopes.
+        """
+        if self._session is not None:
+            yield self._session
+            return
         async with get_session() as session:
+            yield session
+            if write:
+                await session.commit()
+
+    async def _fetch_all(self) -> list[dict[str, Any]]:
+        async with self._session_scope() as session:
             stmt = select(NotificationChannelConfig).order_by(
                 NotificationChannelConfig.channel_type,
             )
@@ -166,8 +212,12 @@ class NotificationSettingsService:
         incoming: dict[str, Any],
     ) -> dict[str, Any]:
         """Merge incoming config, preserving existing secret values when masked."""
-        merged = {**existing, **incoming}
-        for key in _SECRET_KEYS:
-            if incoming.get(key) == _MASK and key in existing:
-                merged[key] = existing[key]
-        return merged
+        return {
+            **existing,
+            **{
+                key: existing[key]
+                if value == _MASK and key in _SECRET_KEYS and key in existing
+                else value
+                for key, value in incoming.items()
+            },
+        }
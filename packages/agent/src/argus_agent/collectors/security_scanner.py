@@ -6,7 +6,7 @@ import asyncio
 import logging
 import os
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
@@ -48,6 +48,21 @@ TEMP_DIRS = ["/tmp", "/dev/shm"]
 # Default scan interval: 5 minutes
 DEFAULT_INTERVAL = 300
 
+# Only the tail of auth.log is inspected on each scan
+_AUTH_LOG_TAIL_LINES = 1000
+# The trailing .* consumes the rest of the line so each line counts at most once
+_FAILED_SSH_RE = re.compile(r"Failed password.*from (\d+\.\d+\.\d+\.\d+).*")
+
+
+def _tail(text: str, n: int) -> str:
+    """Return the last *n* lines of *text* without splitting the whole buffer."""
+    start = len(text) - 1 if text.endswith("\n") else len(text)
+    for _ in range(n):
+        start = text.rfind("\n", 0, start)
+        if start < 0:
+            return text
+    return text[start + 1:]
+
 
 class SecurityScanner:
     """Periodic security scanner — all checks are READ-ONLY.
@@ -61,8 +76,8 @@ class SecurityScanner:
         self._running = False
         self._task: asyncio.Task[None] | None = None
         self._known_ports: set[int] = set()
-        self._known_outbound: set[tuple[str, int]] = set()
-        self._known_executables: set[str] = set()
+        self._known_outbound: frozenset[tuple[str, int]] = frozenset()
+        self._known_executables: frozenset[str] = frozenset()
         self._host_root = get_settings().collector.host_root
         self._last_results: dict[str, Any] = {}
         self._is_saas = get_settings().deployment.mode == "saas"
@@ -210,35 +225,33 @@ class SecurityScanner:
     def _check_open_ports(self) -> dict[str, Any]:
         """Check for new listening ports."""
         events: list[dict[str, Any]] = []
-        current_ports: set[int] = set()
+        # port -> pid of its first listener; dual-stack sockets list a port twice
+        listeners: dict[int, int | None] = {}
 
         try:
             for conn in psutil.net_connections(kind="inet"):
                 if conn.status == "LISTEN":
-                    port = conn.laddr.port
-                    current_ports.add(port)
-
-                    if self._known_ports and port not in self._known_ports:
-                        events.append({
-                            "type": EventType.NEW_OPEN_PORT,
-                            "severity": EventSeverity.NOTABLE,
-                            "message": f"New listening port detected: {port}",
-                            "data": {"port": port, "pid": conn.pid},
-                        })
+                    listeners.setdefault(conn.laddr.port, conn.pid)
         except (psutil.AccessDenied, OSError):
             pass
 
-        if not self._known_ports:
-            self._known_ports = current_ports
-        else:
-            self._known_ports = current_ports
+        if self._known_ports:
+            for port, pid in listeners.items():
+                if port not in self._known_ports:
+                    events.append({
+                        "type": EventType.NEW_OPEN_PORT,
+                        "severity": EventSeverity.NOTABLE,
+                        "message": f"New listening port detected: {port}",
+                        "data": {"port": port, "pid": pid},
+                    })
 
-        return {"listening_ports": sorted(current_ports), "events": events}
+        self._known_ports = set(listeners)
+        return {"listening_ports": sorted(listeners), "events": events}
 
     def _check_failed_ssh(self) -> dict[str, Any]:
         """Read auth.log and count failed SSH attempts per IP."""
         events: list[dict[str, Any]] = []
-        failures: dict[str, int] = defaultdict(int)
+        failures: Counter[str] = Counter()
 
         auth_log = "/var/log/auth.log"
         if self._host_root:
@@ -249,12 +262,8 @@ class SecurityScanner:
             return {"failures_by_ip": {}, "events": events}
 
         try:
-            lines = path.read_text(errors="replace").splitlines()[-1000:]
-            pattern = re.compile(r"Failed password.*from (\d+\.\d+\.\d+\.\d+)")
-            for line in lines:
-                match = pattern.search(line)
-                if match:
-                    failures[match.group(1)] += 1
+            text = _tail(path.read_text(errors="replace"), _AUTH_LOG_TAIL_LINES)
+            failures.update(m.group(1) for m in _FAILED_SSH_RE.finditer(text))
 
             for ip, count in failures.items():
                 if count >= 10:
@@ -368,15 +377,17 @@ class SecurityScanner:
             if not p.exists():
                 continue
 
+            # Directory mtimes are not used to skip rescans: chmod +x on an
+            # existing file does not touch the directory, so it would go unseen.
             try:
-                for entry in os.scandir(resolved):
-                    if entry.is_file():
-                        try:
-                            st = entry.stat()
-                            if st.st_mode & 0o111:
-                                current.add(entry.path)
-                        except OSError:
-                            pass
+                with os.scandir(resolved) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            try:
+                                if entry.stat().st_mode & 0o111:
+                                    current.add(entry.path)
+                            except OSError:
+                                pass
             except (PermissionError, OSError):
                 pass
 
@@ -390,7 +401,7 @@ class SecurityScanner:
                     "data": {"path": path},
                 })
 
-        self._known_executables = current
+        self._known_executables = frozenset(current)
         return {"executables": sorted(current), "events": events}
 
     def _check_process_lineage(self) -> dict[str, Any]:
@@ -438,12 +449,14 @@ class SecurityScanner:
     def _check_outbound_connections(self) -> dict[str, Any]:
         """Track outbound connections, flag new (ip, port) tuples."""
         events: list[dict[str, Any]] = []
-        current: set[tuple[str, int]] = set()
+        current: frozenset[tuple[str, int]] = frozenset()
 
         try:
-            for conn in psutil.net_connections(kind="inet"):
-                if conn.status == "ESTABLISHED" and conn.raddr:
-                    current.add((conn.raddr.ip, conn.raddr.port))
+            current = frozenset(
+                (conn.raddr.ip, conn.raddr.port)
+                for conn in psutil.net_connections(kind="inet")
+                if conn.status == "ESTABLISHED" and conn.raddr
+            )
         except (psutil.AccessDenied, OSError):
             pass
 
@@ -631,7 +644,7 @@ class SecurityScanner:
                     "data": {"path": path},
                 })
 
-        self._known_executables = current
+        self._known_executables = frozenset(current)
         return {"executables": sorted(current), "events": events}
 
     async def _remote_process_lineage(self, tenants: list[dict[str, Any]]) -> dict[str, Any]:
@@ -699,6 +712,6 @@ class SecurityScanner:
                     "data": {"ip": ip, "port": port, "tenant_id": fallback_tid},
                 })
 
-        self._known_outbound = all_current
+        self._known_outbound = frozenset(all_current)
         connections = [{"ip": ip, "port": port} for ip, port in sorted(all_current)]
         return {"connections": connections, "events": events}
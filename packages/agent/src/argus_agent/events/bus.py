@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from collections.abc import Callable, Coroutine
-from dataclasses import asdict
 from typing import Any
 
+import orjson
+
 from argus_agent.events.types import Event, EventSeverity
 
 logger = logging.getLogger("argus.events.bus")
@@ -144,6 +144,7 @@ class RedisEventBus(EventBus):
         self._redis = redis
         self._sub_task: asyncio.Task | None = None  # type: ignore[type-arg]
         self._publishing = False  # prevent rebroadcast loops
+        self._subscribed = asyncio.Event()  # set once the pubsub channel is live
 
     async def start(self) -> None:
         self._sub_task = asyncio.create_task(self._subscribe_loop())
@@ -163,10 +164,9 @@ class RedisEventBus(EventBus):
             return
 
         try:
-            data = asdict(event)
-            # datetime → ISO string for JSON serialization
-            data["timestamp"] = event.timestamp.isoformat()
-            await self._redis.publish(REDIS_EVENTS_CHANNEL, json.dumps(data))
+            # orjson serialises the dataclass directly; timestamps become ISO strings
+            payload = orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS)
+            await self._redis.publish(REDIS_EVENTS_CHANNEL, payload)
         except Exception:
             logger.debug("Failed to publish event to Redis", exc_info=True)
 
@@ -176,11 +176,12 @@ class RedisEventBus(EventBus):
         pubsub = self._redis.pubsub()
         try:
             await pubsub.subscribe(REDIS_EVENTS_CHANNEL)
+            self._subscribed.set()
             async for message in pubsub.listen():
                 if message["type"] != "message":
                     continue
                 try:
-                    data = json.loads(message["data"])
+                    data = orjson.loads(message["data"])
                     event = Event(
                         source=data["source"],
                         type=data["type"],
@@ -199,6 +200,7 @@ class RedisEventBus(EventBus):
         except asyncio.CancelledError:
             pass
         finally:
+            self._subscribed.clear()
             await pubsub.unsubscribe()
             await pubsub.aclose()
 
@@ -27,6 +27,8 @@ class LLMMessage:
     tool_call_id: str = ""
     name: str = ""
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Lazily filled by the agent memory; messages are not mutated after creation
+    _token_estimate: int | None = field(default=None, init=False, repr=False, compare=False)
 
 
 @dataclass
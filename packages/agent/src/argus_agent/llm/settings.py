@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from argus_agent.storage.models import AppConfig
 from argus_agent.storage.repositories import get_session
@@ -19,6 +22,26 @@ _LLM_KEYS = ("llm.provider", "llm.model", "llm.api_key")
 class LLMSettingsService:
     """Read/write LLM settings in the AppConfig key-value table."""
 
+    def __init__(self) -> None:
+        self._session: AsyncSession | None = None
+
+    @asynccontextmanager
+    async def transactional(self) -> AsyncIterator[None]:
+        """Run several calls on this service in one session with a single commit.
+
+        Nested blocks join the outer one, which keeps the session and commits.
+        """
+        if self._session is not None:
+            yield
+            return
+        async with get_session() as session:
+            self._session = session
+            try:
+                yield
+                await session.commit()
+            finally:
+                self._session = None
+
     async def get_all(self, masked: bool = True) -> dict[str, Any]:
         """Return DB-persisted LLM settings. Masks API key by default."""
         raw = await self._fetch_llm_keys()
@@ -32,7 +55,7 @@ class LLMSettingsService:
 
     async def save(self, updates: dict[str, Any]) -> dict[str, Any]:
         """Upsert LLM settings. Skips masked API key to preserve existing."""
-        async with get_session() as session:
+        async with self._session_scope(write=True) as session:
             for field in ("provider", "model", "api_key"):
                 value = updates.get(field)
                 if value is None:
@@ -54,13 +77,11 @@ class LLMSettingsService:
                 else:
                     row.value = str(value)
 
-            await session.commit()
-
         return await self.get_all(masked=True)
 
     async def has_persisted_settings(self) -> bool:
         """Check if any LLM keys exist in the DB."""
-        async with get_session() as session:
+        async with self._session_scope() as session:
             stmt = select(AppConfig).where(AppConfig.key.in_(_LLM_KEYS))
             result = await session.execute(stmt)
             return result.first() is not None
@@ -94,9 +115,23 @@ class LLMSettingsService:
 
     # ---- internal helpers ----
 
+    @asynccontextmanager
+    async def _session_scope(self, write: bool = False) -> AsyncIterator[AsyncSession]:
+        """Yield the active transactional session, or a fresh one.
+
+        A fresh session is committed on exit only for *write* scopes.
+        """
+        if self._session is not None:
+            yield self._session
+            return
+        async with get_session() as session:
+            yield session
+            if write:
+                await session.commit()
+
     async def _fetch_llm_keys(self) -> dict[str, Any]:
         """Fetch all llm.* keys from AppConfig."""
-        async with get_session() as session:
+        async with self._session_scope() as session:
             stmt = select(AppConfig).where(AppConfig.key.in_(_LLM_KEYS))
             result = await session.execute(stmt)
             rows = result.scalars().all()
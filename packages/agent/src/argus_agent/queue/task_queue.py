@@ -10,6 +10,7 @@ from enum import StrEnum
 
 from pydantic import BaseModel, Field
 from redis.asyncio import Redis
+from redis.typing import EncodableT, FieldT
 
 logger = logging.getLogger("argus.queue")
 
@@ -59,6 +60,29 @@ class TaskQueue:
         logger.info("Enqueued task %s for tenant %s", payload.task_id, payload.tenant_id)
         return payload.task_id
 
+    async def enqueue_many(self, payloads: list[TaskPayload]) -> list[str]:
+        """Enqueue several tasks in one pipelined round-trip, preserving order."""
+        if not payloads:
+            return []
+        async with self._redis.pipeline(transaction=False) as pipe:
+            # LPUSH inserts its values left to right, so the first payload
+            # ends up nearest the BRPOP end and is dequeued first.
+            pipe.lpush(
+                TASK_QUEUE_KEY,
+                *(json.dumps(p.model_dump(mode="json")) for p in payloads),
+            )
+            for p in payloads:
+                key = f"{TASK_KEY_PREFIX}{p.task_id}"
+                mapping: dict[FieldT, EncodableT] = {
+                    "status": TaskStatus.PENDING.value,
+                    "tenant_id": p.tenant_id,
+                }
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, TASK_TTL)
+            await pipe.execute()
+        logger.info("Enqueued %d tasks", len(payloads))
+        return [p.task_id for p in payloads]
+
     async def dequeue(self, timeout: int = 5) -> TaskPayload | None:
         """Blocking dequeue — waits up to *timeout* seconds for a task."""
         result = await self._redis.brpop(TASK_QUEUE_KEY, timeout=timeout)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from collections.abc import Callable, Coroutine
+from collections.abc import Awaitable, Callable, Coroutine
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
@@ -12,6 +12,7 @@ from typing import Any
 logger = logging.getLogger("argus.scheduler")
 
 TaskFunc = Callable[[], Coroutine[Any, Any, None]]
+SleepFunc = Callable[[float], Awaitable[Any]]
 
 
 @dataclass
@@ -31,12 +32,14 @@ class ScheduledTask:
 class Scheduler:
     """Runs periodic tasks as asyncio background tasks.
 
-    Each task runs in its own loop with independent intervals.
+    Each task runs in its own loop with independent intervals. *sleep* waits
+    between runs; tests can pass a virtual-time replacement for ``asyncio.sleep``.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, sleep: SleepFunc = asyncio.sleep) -> None:
         self._tasks: dict[str, ScheduledTask] = {}
         self._running = False
+        self._sleep = sleep
 
     def register(
         self,
@@ -110,4 +113,4 @@ class Scheduler:
                 task.error_count += 1
                 logger.exception("Scheduled task '%s' failed", task.name)
 
-            await asyncio.sleep(task.interval_seconds)
+            await self._sleep(task.interval_seconds)
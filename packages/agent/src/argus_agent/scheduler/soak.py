@@ -11,7 +11,6 @@ Enable with:
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import multiprocessing
 import os
@@ -23,10 +22,12 @@ import tempfile
 import time
 import uuid
 from dataclasses import dataclass, field
+from itertools import accumulate
 from pathlib import Path
 from typing import Any
 
 import httpx
+import orjson
 
 logger = logging.getLogger("argus.soak")
 
@@ -44,7 +45,8 @@ ENDPOINTS = [
     ("/multi-error", 5),
 ]
 
-_TOTAL_WEIGHT = sum(w for _, w in ENDPOINTS)
+_ENDPOINT_PATHS = [ep for ep, _ in ENDPOINTS]
+_ENDPOINT_CUM_WEIGHTS = list(accumulate(w for _, w in ENDPOINTS))
 
 
 @dataclass
@@ -63,7 +65,7 @@ def parse_soak_apps() -> list[SoakAppConfig]:
     if not raw:
         return []
     try:
-        items: list[dict[str, Any]] = json.loads(raw)
+        items: list[dict[str, Any]] = orjson.loads(raw)
         return [
             SoakAppConfig(
                 path=item["path"],
@@ -73,20 +75,19 @@ def parse_soak_apps() -> list[SoakAppConfig]:
             )
             for item in items
         ]
-    except (json.JSONDecodeError, KeyError, TypeError):
+    except (orjson.JSONDecodeError, KeyError, TypeError):
         logger.exception("Failed to parse ARGUS_SOAK_APPS")
         return []
 
 
 def _pick_endpoint() -> str:
     """Weighted-random endpoint selection."""
-    r = random.randint(1, _TOTAL_WEIGHT)
-    cumulative = 0
-    for ep, weight in ENDPOINTS:
-        cumulative += weight
-        if r <= cumulative:
-            return ep
-    return "/"
+    return _pick_endpoints(1)[0]
+
+
+def _pick_endpoints(n: int) -> list[str]:
+    """Draw *n* weighted-random endpoints in one call."""
+    return random.choices(_ENDPOINT_PATHS, cum_weights=_ENDPOINT_CUM_WEIGHTS, k=n)
 
 
 # ---------------------------------------------------------------------------
@@ -142,13 +143,16 @@ def _memory_stress(duration_seconds: float, target_fraction: float = 0.7) -> Non
         del blob  # noqa: F821 — may not exist if MemoryError
 
 
-def _create_executable_artifact() -> str:
+def _create_executable_artifact(directory: str | None = None) -> str:
     """Create a temporary executable file for SecurityScanner to detect."""
     name = f"soak_test_{uuid.uuid4().hex[:8]}"
-    path = os.path.join(tempfile.gettempdir(), name)
-    with open(path, "w") as f:
-        f.write("#!/bin/sh\necho soak\n")
-    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    path = os.path.join(directory or tempfile.gettempdir(), name)
+    # Create it executable up front rather than writing, stat-ing and chmod-ing
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o755)
+    try:
+        os.write(fd, b"#!/bin/sh\necho soak\n")
+    finally:
+        os.close(fd)
     logger.info("Security artifact: created executable %s", path)
     return path
 
@@ -177,13 +181,21 @@ def _run_suspicious_process(duration_seconds: float = 10) -> None:
 def _emit_error_burst(count: int = 18) -> None:
     """Emit a burst of ERROR-level log messages for LogWatcher to detect."""
     burst_logger = logging.getLogger("argus.soak.error_burst")
+    if not burst_logger.isEnabledFor(logging.ERROR):
+        return
+    # Build the records directly: the caller frame is meaningless for a
+    # synthetic burst, and skipping findCaller() is most of the per-record cost.
     for i in range(count):
-        burst_logger.error(
+        record = burst_logger.makeRecord(
+            burst_logger.name,
+            logging.ERROR,
+            "(unknown file)",
+            0,
             "Soak test error burst [%d/%d]: simulated error condition id=%s",
-            i + 1,
-            count,
-            uuid.uuid4().hex[:8],
+            (i + 1, count, uuid.uuid4().hex[:8]),
+            None,
         )
+        burst_logger.handle(record)
 
 
 # ---------------------------------------------------------------------------
@@ -5,12 +5,14 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import math
 import os
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import duckdb
+import orjson
 
 logger = logging.getLogger("argus.timeseries")
 
@@ -221,8 +223,35 @@ def insert_metrics_batch(
     if not rows:
         return
     conn = get_connection()
-    prepared = [(ts, name, val, json.dumps(labels or {})) for ts, name, val, labels in rows]
-    conn.executemany("INSERT INTO system_metrics VALUES (?, ?, ?, ?)", prepared)
+    if not all(val is not None and math.isfinite(val) for _, _, val, _ in rows):
+        # JSON has no NaN/inf, so these (and NULLs, which the schema rejects
+        # with the usual constraint error) take the slow per-row bind path
+        prepared = [(ts, name, val, json.dumps(labels or {})) for ts, name, val, labels in rows]
+        conn.executemany("INSERT INTO system_metrics VALUES (?, ?, ?, ?)", prepared)
+        return
+    # The Python API has no Appender and binds executemany parameters row by
+    # row, so ship the batch as one JSON document and unnest it in SQL.
+    # Aware timestamps go through TIMESTAMPTZ, as a bound parameter would;
+    # naive ones are stored as given. Labels keep json.dumps' text.
+    doc = orjson.dumps([
+        {
+            "t": ts,
+            "z": isinstance(ts, datetime) and ts.utcoffset() is not None,
+            "m": name,
+            "v": val,
+            "l": json.dumps(labels or {}),
+        }
+        for ts, name, val, labels in rows
+    ])
+    conn.execute(
+        "INSERT INTO system_metrics "
+        "SELECT CASE WHEN r.z THEN r.t::TIMESTAMPTZ::TIMESTAMP ELSE r.t::TIMESTAMP END, "
+        "r.m, r.v, r.l FROM ("
+        "SELECT unnest(json_transform(?, "
+        """'[{"t": "VARCHAR", "z": "BOOLEAN", "m": "VARCHAR", "v": "DOUBLE", "l": "VARCHAR"}]'"""
+        ")) AS r)",
+        [doc.decode()],
+    )
 
 
 def insert_log_entry(
@@ -319,13 +348,12 @@ def query_metrics_summary(
 def query_latest_metrics() -> dict[str, float]:
     """Get the most recent value for each metric name."""
     conn = get_connection()
+    # arg_max answers this in one grouped scan; a correlated MAX() subquery
+    # (or a (metric_name, timestamp) index, which DuckDB won't use here) doesn't
     result = conn.execute("""
-        SELECT metric_name, value
+        SELECT metric_name, arg_max(value, timestamp)
         FROM system_metrics
-        WHERE timestamp = (
-            SELECT MAX(timestamp) FROM system_metrics s2
-            WHERE s2.metric_name = system_metrics.metric_name
-        )
+        GROUP BY metric_name
     """).fetchall()
     return {row[0]: row[1] for row in result}
 
@@ -4,9 +4,10 @@ from __future__ import annotations
 
 import logging
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 from typing import Any
 
-from sqlalchemy import func, select, text
+from sqlalchemy import case, func, select, text
 
 from argus_agent.config import get_settings
 from argus_agent.storage.models import TokenUsage
@@ -68,15 +69,24 @@ _STRFTIME_FORMATS: dict[str, str] = {
     "month": "%Y-%m",
 }
 
-_TO_CHAR_FORMATS: dict[str, str] = {
-    "hour": "YYYY-MM-DD HH24:00",
-    "day": "YYYY-MM-DD",
-    "week": "IYYY-IW",
-    "month": "YYYY-MM",
-}
 
+def _format_bucket(bucket: Any, granularity: str) -> Any:
+    """Label a Postgres ``date_trunc`` bucket the way ``to_char`` used to.
 
-def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    Weeks stay ISO weeks (``IYYY-IW``). Already-formatted SQLite buckets pass
+    through unchanged.
+    """
+    if not isinstance(bucket, datetime):
+        return bucket
+    if granularity == "week":
+        year, week, _ = bucket.isocalendar()
+        return f"{year}-{week:02d}"
+    return bucket.strftime(_STRFTIME_FORMATS[granularity])
+
+
+@lru_cache(maxsize=256)
+def _model_rates(model: str) -> tuple[float, float]:
+    """Resolve (input, output) per-1K rates for *model*, memoised per name."""
     rates = _COST_PER_1K.get(model)
     if rates is None:
         # Try prefix match: longest matching key wins
@@ -85,7 +95,12 @@ def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> fl
             if key != "_default" and model.startswith(key) and len(key) > len(best):
                 best = key
         rates = _COST_PER_1K[best] if best else _COST_PER_1K["_default"]
-    return (prompt_tokens / 1000) * rates[0] + (completion_tokens / 1000) * rates[1]
+    return rates
+
+
+def _estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    input_rate, output_rate = _model_rates(model)
+    return (prompt_tokens / 1000) * input_rate + (completion_tokens / 1000) * output_rate
 
 
 class TokenUsageService:
@@ -128,13 +143,16 @@ class TokenUsageService:
         """Aggregate token usage by time bucket."""
         since = since or datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=24)
 
+        if granularity not in _STRFTIME_FORMATS:
+            granularity = "hour"
+
         async with get_session() as session:
             if _is_postgres():
-                fmt = _TO_CHAR_FORMATS.get(granularity, _TO_CHAR_FORMATS["hour"])
-                bucket_expr = func.to_char(TokenUsage.timestamp, fmt)
+                # Group on the native truncated timestamp and format only the
+                # resulting buckets, instead of running to_char() on every row
+                bucket_expr = func.date_trunc(granularity, TokenUsage.timestamp)
             else:
-                fmt = _STRFTIME_FORMATS.get(granularity, _STRFTIME_FORMATS["hour"])
-                bucket_expr = func.strftime(fmt, TokenUsage.timestamp)
+                bucket_expr = func.strftime(_STRFTIME_FORMATS[granularity], TokenUsage.timestamp)
             stmt = (
                 select(
                     bucket_expr.label("bucket"),
@@ -159,7 +177,7 @@ class TokenUsageService:
             result = await session.execute(stmt)
             return [
                 {
-                    "bucket": row.bucket,
+                    "bucket": _format_bucket(row.bucket, granularity),
                     "prompt_tokens": row.prompt_tokens or 0,
                     "completion_tokens": row.completion_tokens or 0,
                     "total_tokens": row.total_tokens or 0,
@@ -217,67 +235,44 @@ class TokenUsageService:
         week_start = today_start - timedelta(days=now.weekday())
         month_start = today_start.replace(day=1)
 
-        async with get_session() as session:
-            # All-time totals
-            stmt_all = select(
-                func.coalesce(func.sum(TokenUsage.prompt_tokens), 0).label("prompt"),
-                func.coalesce(func.sum(TokenUsage.completion_tokens), 0).label("completion"),
-                func.coalesce(
-                    func.sum(TokenUsage.prompt_tokens + TokenUsage.completion_tokens), 0
-                ).label("total"),
-                func.count().label("requests"),
-            )
-            row_all = (await session.execute(stmt_all)).one()
-
-            # Today
-            stmt_today = select(
-                func.coalesce(
-                    func.sum(TokenUsage.prompt_tokens + TokenUsage.completion_tokens), 0
-                ).label("total"),
-            ).where(TokenUsage.timestamp >= today_start)
-            today_tokens = (await session.execute(stmt_today)).scalar() or 0
-
-            # This week
-            stmt_week = select(
-                func.coalesce(
-                    func.sum(TokenUsage.prompt_tokens + TokenUsage.completion_tokens), 0
-                ).label("total"),
-            ).where(TokenUsage.timestamp >= week_start)
-            week_tokens = (await session.execute(stmt_week)).scalar() or 0
-
-            # This month
-            stmt_month = select(
-                func.coalesce(
-                    func.sum(TokenUsage.prompt_tokens + TokenUsage.completion_tokens), 0
-                ).label("total"),
-            ).where(TokenUsage.timestamp >= month_start)
-            month_tokens = (await session.execute(stmt_month)).scalar() or 0
-
-            # Estimated cost — aggregate per model
-            stmt_cost = (
-                select(
-                    TokenUsage.model,
-                    func.sum(TokenUsage.prompt_tokens).label("prompt"),
-                    func.sum(TokenUsage.completion_tokens).label("completion"),
-                )
-                .group_by(TokenUsage.model)
-            )
-            cost_rows = (await session.execute(stmt_cost)).all()
-            estimated_cost = sum(
-                _estimate_cost(r.model, r.prompt or 0, r.completion or 0)
-                for r in cost_rows
+        total = TokenUsage.prompt_tokens + TokenUsage.completion_tokens
+
+        def _tokens_since(start: datetime) -> Any:
+            return func.coalesce(
+                func.sum(case((TokenUsage.timestamp >= start, total), else_=0)), 0
             )
 
-        total_requests = row_all.requests or 0
-        total_tokens = row_all.total or 0
+        # One scan: the per-model rows carry every window's sums, and are
+        # folded here so cost can still be priced per model
+        stmt = select(
+            TokenUsage.model,
+            func.coalesce(func.sum(TokenUsage.prompt_tokens), 0).label("prompt"),
+            func.coalesce(func.sum(TokenUsage.completion_tokens), 0).label("completion"),
+            func.count().label("requests"),
+            _tokens_since(today_start).label("today"),
+            _tokens_since(week_start).label("week"),
+            _tokens_since(month_start).label("month"),
+        ).group_by(TokenUsage.model)
+
+        async with get_session() as session:
+            rows = (await session.execute(stmt)).all()
+
+        prompt_tokens = sum(r.prompt or 0 for r in rows)
+        completion_tokens = sum(r.completion or 0 for r in rows)
+        total_requests = sum(r.requests or 0 for r in rows)
+        total_tokens = prompt_tokens + completion_tokens
+        estimated_cost = sum(
+            _estimate_cost(r.model, r.prompt or 0, r.completion or 0) for r in rows
+        )
+
         return {
             "total_tokens": total_tokens,
             "total_requests": total_requests,
-            "prompt_tokens": row_all.prompt or 0,
-            "completion_tokens": row_all.completion or 0,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
             "avg_tokens_per_request": round(total_tokens / total_requests) if total_requests else 0,
             "estimated_cost_usd": round(estimated_cost, 4),
-            "today_tokens": today_tokens,
-            "this_week_tokens": week_tokens,
-            "this_month_tokens": month_tokens,
+            "today_tokens": sum(r.today or 0 for r in rows),
+            "this_week_tokens": sum(r.week or 0 for r in rows),
+            "this_month_tokens": sum(r.month or 0 for r in rows),
         }
@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +17,10 @@ logger = logging.getLogger("argus.tools.log")
 MAX_RESULTS = 100
 MAX_LINE_LENGTH = 500
 
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
 
 def _resolve_path(file_path: str) -> Path:
     """Resolve a log file path, prepending host root if configured."""
@@ -25,6 +31,20 @@ def _resolve_path(file_path: str) -> Path:
     return Path(file_path)
 
 
+def _is_plain(pattern: str) -> bool:
+    """True if *pattern* has no regex metacharacters, i.e. it is a literal string."""
+    return _REGEX_METACHARS.isdisjoint(pattern)
+
+
+def _line_matcher(pattern: str, case_insensitive: bool) -> Callable[[str], object]:
+    """Return a per-line match predicate; raises ``re.error`` for a bad regex."""
+    if not case_insensitive and _is_plain(pattern):
+        # A case-sensitive plain string needs no regex engine at all
+        return lambda line: pattern in line
+    # re.compile() keeps its own cache of recent patterns
+    return re.compile(pattern, re.IGNORECASE if case_insensitive else 0).search
+
+
 class LogSearchTool(Tool):
     """Search log files by pattern, time range, or severity."""
 
@@ -92,16 +112,20 @@ class LogSearchTool(Tool):
             return {"error": f"Not a file: {file_path}", "matches": []}
 
         try:
-            flags = re.IGNORECASE if case_insensitive else 0
-            compiled = re.compile(pattern, flags)
+            is_match = _line_matcher(pattern, case_insensitive)
         except re.error as e:
             return {"error": f"Invalid regex pattern: {e}", "matches": []}
 
         matches = []
         try:
-            lines = resolved.read_text(errors="replace").splitlines()
+            text = resolved.read_text(errors="replace")
+            # A plain string cannot span lines, so one scan of the whole file
+            # can rule out a miss before paying for splitlines()
+            if _is_plain(pattern) and not is_match(text):
+                text = ""
+            lines = text.splitlines()
             for i, line in enumerate(lines):
-                if compiled.search(line):
+                if is_match(line):
                     start = max(0, i - context_lines)
                     end = min(len(lines), i + context_lines + 1)
                     context = [
@@ -136,6 +160,33 @@ class LogSearchTool(Tool):
         }
 
 
+def _read_tail(path: Path, num_lines: int) -> tuple[list[str], int | None]:
+    """Return the last *num_lines* lines of *path* and its total line count.
+
+    Blocks are read backwards from the end until the tail is covered, so the
+    cost depends on the tail, not the file size. The total is only known when
+    that reaches the start of the file; otherwise it is ``None``. Lines are
+    split with ``str.splitlines()``, like a full read.
+    """
+    with path.open("rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        buf = b""
+        # num_lines + 1 newlines guarantee num_lines whole lines after a partial first one.
+        # Files using only other line breaks just read further back.
+        while pos > 0 and buf.count(b"\n") <= num_lines:
+            step = min(_TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+
+    lines = buf.decode(errors="replace").splitlines()
+    if pos > 0:
+        # The first piece starts mid-line
+        lines = lines[1:]
+    tail = lines[-num_lines:] if num_lines > 0 else []
+    return tail, len(lines) if pos == 0 else None
+
+
 class LogTailTool(Tool):
     """Get the latest N lines from a log file."""
 
@@ -185,11 +236,12 @@ class LogTailTool(Tool):
             return {"error": f"Not a file: {file_path}", "lines": []}
 
         try:
-            all_lines = resolved.read_text(errors="replace").splitlines()
-            tail = all_lines[-num_lines:]
+            tail, total_lines = _read_tail(resolved, num_lines)
             result_lines = [
                 {
-                    "line_number": len(all_lines) - len(tail) + i + 1,
+                    "line_number": (
+                        total_lines - len(tail) + i + 1 if total_lines is not None else None
+                    ),
                     "text": line[:MAX_LINE_LENGTH],
                 }
                 for i, line in enumerate(tail)
@@ -201,7 +253,7 @@ class LogTailTool(Tool):
 
         return {
             "file": file_path,
-            "total_lines": len(all_lines),
+            "total_lines": total_lines,
             "returned": len(result_lines),
             "lines": result_lines,
             "display_type": "log_viewer",
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import cache
 from typing import Any
 
 from argus_agent.tools.base import Tool, ToolRisk, resolve_time_range
@@ -11,6 +12,25 @@ from argus_agent.tools.base import Tool, ToolRisk, resolve_time_range
 logger = logging.getLogger("argus.tools.sdk_events")
 
 
+@cache
+def _events_query(has_until: bool, has_service: bool, has_event_type: bool) -> str:
+    """Build the sdk_events SELECT for one combination of optional filters.
+
+    Parameters bind in order: since, [until], [service], [event_type], limit.
+    """
+    conditions = ["timestamp >= ?"]
+    if has_until:
+        conditions.append("timestamp <= ?")
+    if has_service:
+        conditions.append("service = ?")
+    if has_event_type:
+        conditions.append("event_type = ?")
+    return (
+        "SELECT timestamp, service, event_type, data FROM sdk_events "  # noqa: S608
+        f"WHERE {' AND '.join(conditions)} ORDER BY timestamp DESC LIMIT ?"
+    )
+
+
 class SDKEventsTool(Tool):
     """Query SDK telemetry events from monitored applications."""
 
@@ -85,30 +105,17 @@ class SDKEventsTool(Tool):
             since_minutes, kwargs.get("since"), kwargs.get("until"),
         )
 
-        conditions = []
-        params: list[Any] = []
-
-        conditions.append("timestamp >= ?")
-        params.append(since_dt)
-
+        params: list[Any] = [since_dt]
         if until_dt:
-            conditions.append("timestamp <= ?")
             params.append(until_dt)
-
         if service:
-            conditions.append("service = ?")
             params.append(service)
         if event_type:
-            conditions.append("event_type = ?")
             params.append(event_type)
-
-        where = " AND ".join(conditions)
         params.append(limit)
 
         result = repo.execute_raw(
-            f"SELECT timestamp, service, event_type, data FROM sdk_events "  # noqa: S608
-            f"WHERE {where} ORDER BY timestamp DESC LIMIT ?",
-            params,
+            _events_query(bool(until_dt), bool(service), bool(event_type)), params,
         )
 
         events = []
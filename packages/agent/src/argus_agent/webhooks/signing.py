@@ -6,6 +6,34 @@ import hashlib
 import hmac
 import time
 import uuid
+from collections import OrderedDict
+from functools import lru_cache
+
+# Recently accepted (secret id, nonce) pairs with the time they were received,
+# oldest first, for replay rejection. Receive times are monotonic in insertion
+# order (sender timestamps need not be), so expired entries sit at the front;
+# the cap bounds memory under bursts.
+_NONCE_CACHE_SIZE = 10_000
+_seen_nonces: OrderedDict[tuple[bytes, str], float] = OrderedDict()
+
+
+@lru_cache(maxsize=32)
+def _keyed_hmac(secret: str) -> hmac.HMAC:
+    """An HMAC-SHA256 already keyed with *secret*; callers must ``copy()`` it."""
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+@lru_cache(maxsize=32)
+def _secret_id(secret: str) -> bytes:
+    """A digest naming *secret* in the nonce cache without storing it."""
+    return hashlib.sha256(secret.encode()).digest()
+
+
+def _compute_signature(secret: str, message: bytes) -> str:
+    # Copying the keyed state skips re-padding and hashing the key every call
+    mac = _keyed_hmac(secret).copy()
+    mac.update(message)
+    return mac.hexdigest()
 
 
 def sign_payload(payload: bytes, secret: str) -> dict[str, str]:
@@ -16,7 +44,7 @@ def sign_payload(payload: bytes, secret: str) -> dict[str, str]:
     timestamp = str(int(time.time()))
     nonce = uuid.uuid4().hex[:16]
     message = f"{timestamp}.{nonce}.".encode() + payload
-    signature = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    signature = _compute_signature(secret, message)
     return {
         "X-Argus-Signature": f"sha256={signature}",
         "X-Argus-Timestamp": timestamp,
@@ -35,7 +63,8 @@ def verify_signature(
     """Verify an incoming webhook signature.
 
     Returns False if the signature is invalid, the timestamp is stale
-    (older than *max_age* seconds), or any input is malformed.
+    (older than *max_age* seconds), the nonce was already accepted within
+    that window (a replay), or any input is malformed.
     """
     # Validate timestamp is a number and within max_age
     try:
@@ -48,8 +77,31 @@ def verify_signature(
 
     # Recompute expected signature
     message = f"{timestamp}.{nonce}.".encode() + payload
-    expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+    expected = _compute_signature(secret, message)
     expected_full = f"sha256={expected}"
 
     # Constant-time comparison
-    return hmac.compare_digest(expected_full, signature)
+    if not hmac.compare_digest(expected_full, signature):
+        return False
+
+    # Only nonces with a valid signature are recorded, so forgeries cannot
+    # fill the cache
+    return _remember_nonce(_secret_id(secret), nonce, max_age)
+
+
+def _remember_nonce(secret_id: bytes, nonce: str, max_age: int) -> bool:
+    """Record *nonce* for *secret_id*; False if it was already seen recently."""
+    now = time.time()
+    # A timestamp may lead the receive time by up to max_age and is accepted
+    # for max_age after that, so a nonce can be replayed for 2 * max_age
+    cutoff = now - 2 * max_age
+    while _seen_nonces and next(iter(_seen_nonces.values())) < cutoff:
+        _seen_nonces.popitem(last=False)
+
+    key = (secret_id, nonce)
+    if key in _seen_nonces:
+        return False
+    _seen_nonces[key] = now
+    if len(_seen_nonces) > _NONCE_CACHE_SIZE:
+        _seen_nonces.popitem(last=False)
+    return True
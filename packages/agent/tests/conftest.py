@@ -0,0 +1,172 @@
+"""Shared test fixtures."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fakeredis import FakeServer
+from fakeredis import aioredis as fakeredis_aioredis
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from argus_agent import config as config_mod
+from argus_agent.config import Settings
+from argus_agent.storage.models import Base
+
+try:
+    import uvloop
+except ImportError:  # uvloop ships with uvicorn[standard], but not on Windows
+    uvloop = None
+
+if uvloop is not None:
+
+    # Optional: the hookspec only exists in newer pytest-asyncio releases, and
+    # older ones would otherwise reject the conftest as an unknown hook
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):  # type: ignore[no-untyped-def]
+        """Run async tests on uvloop, whose scheduler is cheaper than asyncio's."""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+def pytest_report_header(config):  # type: ignore[no-untyped-def]
+    """Name the event loop in the run header, so CI logs show which one ran."""
+    if uvloop is None:
+        return "event loop: asyncio (uvloop not installed)"
+    hook = getattr(config.hook, "pytest_asyncio_loop_factories", None)
+    if hook is None or hook.spec is None:
+        return "event loop: asyncio (pytest-asyncio has no loop factory hook)"
+    return f"event loop: uvloop {uvloop.__version__}"
+
+
+def batch_metric_rows(
+    name: str,
+    values: Iterable[float],
+    base_ts: datetime,
+    step: timedelta = timedelta(0),
+) -> list[tuple[datetime, str, float, None]]:
+    """Rows for ``insert_metrics_batch``: the i-th value is stamped ``base_ts + i * step``."""
+    return [(base_ts + i * step, name, value, None) for i, value in enumerate(values)]
+
+
+def timeseries_db_path(directory: Path) -> str:
+    """Where a test's DuckDB store lives: a file in *directory*, or memory.
+
+    Setting ``ARGUS_TS_TEST_MEM=1`` keeps the stores in memory, which skips
+    all disk I/O and gives every xdist worker its own database for free.
+    """
+    if os.environ.get("ARGUS_TS_TEST_MEM") == "1":
+        return ":memory:"
+    return str(directory / "test_ts.duckdb")
+
+
+@pytest.fixture(scope="session")
+def _default_settings() -> Settings:
+    """A pristine ``Settings()`` validated once per session."""
+    return Settings()
+
+
+@pytest.fixture()
+def fresh_settings(_default_settings, monkeypatch) -> Settings:
+    """Install a deep copy of the default settings as the global singleton.
+
+    Copying skips the pydantic validation that a reset + ``get_settings()``
+    would redo for every test.
+    """
+    settings = _default_settings.model_copy(deep=True)
+    monkeypatch.setattr(config_mod, "_settings", settings)
+    return settings
+
+
+@pytest.fixture(scope="session")
+def _redis_server() -> FakeServer:
+    """One in-memory fake Redis server; clients flush their DB per test."""
+    return FakeServer()
+
+
+@pytest.fixture
+async def redis(_redis_server):
+    """A flushed Redis client for one test.
+
+    Uses the shared fake server unless ``ARGUS_TEST_REDIS_URL`` points at a
+    real (disposable!) Redis, which is then flushed before every test.
+    """
+    url = os.environ.get("ARGUS_TEST_REDIS_URL")
+    if url:
+        r = Redis.from_url(url, decode_responses=True)
+    else:
+        r = fakeredis_aioredis.FakeRedis(server=_redis_server, decode_responses=True)
+    await r.flushdb()
+    yield r
+    await r.aclose()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def _sqlite_engine():
+    """One in-memory SQLite engine with the schema created once per session."""
+    # StaticPool keeps a single connection (and its page cache) alive for the
+    # whole session, so the schema persists without reopening the database.
+    # Under pytest-xdist each worker gets its own named in-memory database.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///file:argus_test_{worker}?mode=memory&cache=shared&uri=true",
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's implicit BEGIN breaks SAVEPOINT handling; emit BEGIN ourselves.
+    # WAL is not available for in-memory databases, so only the cheap pragmas apply.
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_connection(dbapi_conn, connection_record):  # type: ignore[no-untyped-def]
+        dbapi_conn.isolation_level = None
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA busy_timeout=3000")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):  # type: ignore[no-untyped-def]
+        conn.exec_driver_sql("BEGIN")
+
+    # This also opens the pool's only connection, so no test pays for connecting
+    async with engine.begin() as conn:
+        # The database is brand new, so skip the per-table existence checks
+        await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture()
+async def _init_db(_sqlite_engine, monkeypatch):
+    """Point the operational DB at the shared engine inside a rolled-back transaction.
+
+    Sessions join the outer transaction via SAVEPOINTs, so service-level
+    ``commit()`` calls are visible within the test but discarded afterwards.
+    """
+    import argus_agent.storage.database as db_mod
+    import argus_agent.storage.repositories as repo_mod
+    from argus_agent.storage.sqlite_operational import SQLiteOperationalRepository
+
+    async with _sqlite_engine.connect() as conn:
+        await conn.begin()
+        factory = async_sessionmaker(
+            bind=conn,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+
+        monkeypatch.setattr(db_mod, "_session_factory", factory)
+        monkeypatch.setattr(repo_mod, "_operational_repo", SQLiteOperationalRepository())
+
+        yield
+
+        await conn.rollback()
@@ -7,11 +7,12 @@ from datetime import UTC, datetime, timedelta
 import pytest
 
 from argus_agent.baseline.tracker import BaselineTracker
+from tests.conftest import batch_metric_rows, timeseries_db_path
 
 
 @pytest.fixture
 def db_path(tmp_path):
-    return str(tmp_path / "test_ts.duckdb")
+    return timeseries_db_path(tmp_path)
 
 
 @pytest.fixture
@@ -41,17 +42,11 @@ def tracker(setup_db):
 
 
 def _insert_synthetic_data(metric_name: str, values: list[float], hours_ago: int = 1):
-    """Insert synthetic metric data points."""
-    from argus_agent.storage.timeseries import get_connection
+    """Insert synthetic metric data points, one minute apart."""
+    from argus_agent.storage.timeseries import insert_metrics_batch
 
-    conn = get_connection()
     base_time = datetime.now(UTC) - timedelta(hours=hours_ago)
-    for i, val in enumerate(values):
-        ts = base_time + timedelta(minutes=i)
-        conn.execute(
-            "INSERT INTO system_metrics VALUES (?, ?, ?, ?)",
-            [ts, metric_name, val, "{}"],
-        )
+    insert_metrics_batch(batch_metric_rows(metric_name, values, base_time, timedelta(minutes=1)))
 
 
 def test_update_baselines_empty_db(tracker: BaselineTracker):
@@ -128,16 +123,12 @@ def test_format_for_prompt_with_data(tracker: BaselineTracker):
 
 def test_old_data_excluded(tracker: BaselineTracker):
     """Data older than 7 days is excluded from baseline computation."""
-    from argus_agent.storage.timeseries import get_connection
+    from argus_agent.storage.timeseries import insert_metrics_batch
 
-    conn = get_connection()
     old_time = datetime.now(UTC) - timedelta(days=10)
-    for i in range(20):
-        ts = old_time + timedelta(minutes=i)
-        conn.execute(
-            "INSERT INTO system_metrics VALUES (?, ?, ?, ?)",
-            [ts, "old_metric", 99.0, "{}"],
-        )
+    insert_metrics_batch(
+        batch_metric_rows("old_metric", [99.0] * 20, old_time, timedelta(minutes=1))
+    )
 
     tracker.update_baselines()
     assert tracker.get_baseline("old_metric") is None
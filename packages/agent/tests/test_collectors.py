@@ -21,6 +21,7 @@ from argus_agent.collectors.system_metrics import (
 from argus_agent.config import reset_settings
 from argus_agent.events.bus import reset_event_bus
 from argus_agent.storage.timeseries import close_timeseries, init_timeseries
+from tests.conftest import timeseries_db_path
 
 
 @pytest.fixture(autouse=True)
@@ -33,12 +34,10 @@ def _reset():
 
 
 @pytest.fixture()
-def _ts_db():
-    with tempfile.TemporaryDirectory() as d:
-        db_path = str(Path(d) / "test_ts.duckdb")
-        init_timeseries(db_path)
-        yield
-        close_timeseries()
+def _ts_db(tmp_path):
+    init_timeseries(timeseries_db_path(tmp_path))
+    yield
+    close_timeseries()
 
 
 class TestSystemMetricsCollector:
@@ -7,20 +7,12 @@ import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from fakeredis import aioredis as fakeredis_aioredis
 
 from argus_agent.api.protocol import ServerMessage, ServerMessageType
 from argus_agent.queue.distributed_manager import DistributedConnectionManager
 from argus_agent.queue.task_queue import BROADCAST_KEY_PREFIX
 
 
-@pytest.fixture
-async def redis():
-    r = fakeredis_aioredis.FakeRedis(decode_responses=True)
-    yield r
-    await r.aclose()
-
-
 def _make_local_manager():
     m = MagicMock()
     m.connect = AsyncMock()
@@ -60,9 +52,8 @@ class TestDistributedConnectionManager:
         assert received[0]["message"]["type"] == "alert"
 
     @pytest.mark.asyncio
-    async def test_subscribe_delivers_locally(self):
+    async def test_subscribe_delivers_locally(self, redis):
         """The subscription loop should forward Redis messages to local."""
-        redis = fakeredis_aioredis.FakeRedis(decode_responses=True)
         local = _make_local_manager()
         mgr = DistributedConnectionManager(local, redis)
 
@@ -81,7 +72,6 @@ class TestDistributedConnectionManager:
         assert local.broadcast.called
 
         await mgr.stop()
-        await redis.aclose()
 
     @pytest.mark.asyncio
     async def test_connect_disconnect_delegate(self, redis):
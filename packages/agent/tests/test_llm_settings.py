@@ -3,32 +3,10 @@
 from __future__ import annotations
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 
+from argus_agent import config as config_mod
+from argus_agent.config import LLMConfig, Settings
 from argus_agent.llm.settings import _MASK, LLMSettingsService
-from argus_agent.storage.models import Base
-
-
-@pytest.fixture()
-async def _init_db(monkeypatch):
-    """Create an in-memory SQLite database for tests."""
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
-    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    import argus_agent.storage.database as db_mod
-    import argus_agent.storage.repositories as repo_mod
-    from argus_agent.storage.sqlite_operational import SQLiteOperationalRepository
-
-    monkeypatch.setattr(db_mod, "_session_factory", factory)
-    monkeypatch.setattr(repo_mod, "_operational_repo", SQLiteOperationalRepository())
-
-    yield
-
-    await engine.dispose()
 
 
 @pytest.mark.asyncio
@@ -41,57 +19,81 @@ async def test_empty_db_returns_empty():
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("_init_db")
-async def test_save_and_retrieve():
+@pytest.mark.parametrize(
+    ("saves", "expected_raw"),
+    [
+        pytest.param(
+            [{
+                "provider": "anthropic",
+                "model": "claude-sonnet-4-5-20250929",
+                "api_key": "sk-ant-secret",
+            }],
+            {
+                "provider": "anthropic",
+                "model": "claude-sonnet-4-5-20250929",
+                "api_key": "sk-ant-secret",
+            },
+            id="save_and_retrieve",
+        ),
+        pytest.param(
+            [{"provider": "openai", "api_key": "sk-real-key"}],
+            {"provider": "openai", "api_key": "sk-real-key"},
+            id="masked_api_key",
+        ),
+        pytest.param(
+            # Second save simulates the UI sending back the masked key
+            [{"api_key": "sk-original"}, {"api_key": _MASK}],
+            {"api_key": "sk-original"},
+            id="preserves_existing_when_masked",
+        ),
+        pytest.param(
+            # Second save updates only the model
+            [
+                {"provider": "openai", "model": "gpt-4o", "api_key": "sk-123"},
+                {"model": "gpt-4o-mini"},
+            ],
+            {"provider": "openai", "model": "gpt-4o-mini", "api_key": "sk-123"},
+            id="partial_update",
+        ),
+    ],
+)
+async def test_save_variants(saves, expected_raw):
     svc = LLMSettingsService()
-    await svc.save({
-        "provider": "anthropic",
-        "model": "claude-sonnet-4-5-20250929",
-        "api_key": "sk-ant-secret",
-    })
-
-    raw = await svc.get_raw()
-    assert raw["provider"] == "anthropic"
-    assert raw["model"] == "claude-sonnet-4-5-20250929"
-    assert raw["api_key"] == "sk-ant-secret"
+    async with svc.transactional():
+        for updates in saves:
+            await svc.save(updates)
 
-
-@pytest.mark.asyncio
-@pytest.mark.usefixtures("_init_db")
-async def test_masked_api_key():
-    svc = LLMSettingsService()
-    await svc.save({"provider": "openai", "api_key": "sk-real-key"})
+    assert await svc.get_raw() == expected_raw
 
     masked = await svc.get_all(masked=True)
-    assert masked["api_key"] == _MASK
-    assert masked["provider"] == "openai"
+    assert masked == {**expected_raw, "api_key": _MASK}
 
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("_init_db")
-async def test_save_preserves_existing_when_masked():
+async def test_nested_transactional_joins_outer():
     svc = LLMSettingsService()
-    await svc.save({"api_key": "sk-original"})
+    with pytest.raises(RuntimeError):
+        async with svc.transactional():
+            async with svc.transactional():
+                await svc.save({"provider": "openai"})
+            # Still inside the outer block: nothing was committed yet
+            assert svc._session is not None
+            raise RuntimeError("boom")
 
-    # Simulate UI sending back masked key
-    await svc.save({"api_key": _MASK})
-
-    raw = await svc.get_raw()
-    assert raw["api_key"] == "sk-original"
+    assert await svc.get_raw() == {}
 
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("_init_db")
-async def test_partial_update():
+async def test_transactional_discards_on_error():
     svc = LLMSettingsService()
-    await svc.save({"provider": "openai", "model": "gpt-4o", "api_key": "sk-123"})
-
-    # Update only model
-    await svc.save({"model": "gpt-4o-mini"})
+    with pytest.raises(RuntimeError):
+        async with svc.transactional():
+            await svc.save({"provider": "openai"})
+            raise RuntimeError("boom")
 
-    raw = await svc.get_raw()
-    assert raw["provider"] == "openai"
-    assert raw["model"] == "gpt-4o-mini"
-    assert raw["api_key"] == "sk-123"
+    assert await svc.get_raw() == {}
 
 
 @pytest.mark.asyncio
@@ -116,9 +118,6 @@ async def test_apply_to_settings_overrides(monkeypatch):
     await svc.save({"provider": "anthropic", "model": "claude-opus-4", "api_key": "sk-test"})
 
     # Set up a fresh Settings singleton
-    from argus_agent import config as config_mod
-    from argus_agent.config import LLMConfig, Settings
-
     test_settings = Settings(llm=LLMConfig(provider="openai", model="gpt-4o", api_key="old-key"))
     monkeypatch.setattr(config_mod, "get_settings", lambda: test_settings)
 
@@ -134,9 +133,6 @@ async def test_apply_to_settings_overrides(monkeypatch):
 async def test_apply_to_settings_noop_when_empty(monkeypatch):
     svc = LLMSettingsService()
 
-    from argus_agent import config as config_mod
-    from argus_agent.config import LLMConfig, Settings
-
     test_settings = Settings(llm=LLMConfig(provider="openai", model="gpt-4o"))
     monkeypatch.setattr(config_mod, "get_settings", lambda: test_settings)
 
@@ -7,15 +7,9 @@ import json
 import pytest
 
 from argus_agent.agent.memory import ConversationMemory, _estimate_tokens, _summarize_tool_result
-from argus_agent.config import reset_settings
 from argus_agent.llm.base import LLMMessage
 
-
-@pytest.fixture(autouse=True)
-def _reset():
-    reset_settings()
-    yield
-    reset_settings()
+pytestmark = pytest.mark.usefixtures("fresh_settings")
 
 
 class TestConversationMemory:
@@ -65,6 +59,11 @@ class TestConversationMemory:
         ctx = mem.get_context_messages("System prompt")
         # Should have been truncated
         assert len(ctx) < 201  # Less than system + 200 messages
+        # The kept window is the newest tail of the history, in order
+        kept = ctx[1:]
+        assert kept == mem.messages[-len(kept):]
+        # Truncation works on a copy; the full history is retained
+        assert len(mem.messages) == 200
 
     def test_conversation_id_auto_generated(self):
         mem = ConversationMemory()
@@ -95,6 +94,14 @@ class TestTokenEstimation:
         tokens = _estimate_tokens(msg)
         assert tokens > 4
 
+    def test_estimate_cached_on_message(self):
+        msg = LLMMessage(role="user", content="x" * 40)
+        assert _estimate_tokens(msg) == 14
+        assert msg._token_estimate == 14
+        # Cached value is returned without recounting
+        msg._token_estimate = 99
+        assert _estimate_tokens(msg) == 99
+
 
 class TestToolResultSummarization:
     def test_summarize_error(self):
@@ -125,3 +132,17 @@ class TestToolResultSummarization:
         data = json.loads(result)
         assert "content_preview" in data
         assert len(data["content_preview"]) < 300
+
+    def test_old_tool_results_summarized_in_context(self):
+        mem = ConversationMemory()
+        tc = {"id": "tc_1", "function": {"name": "log_search"}}
+        mem.add_assistant_message(tool_calls=[tc])
+        mem.add_tool_result("tc_1", "log_search", {"path": "/var/log/app", "content": "z" * 500})
+        for i in range(6):
+            mem.add_user_message(f"follow-up {i}")
+
+        ctx = mem.get_context_messages("System prompt")
+        tool_msg = next(m for m in ctx if m.role == "tool")
+        data = json.loads(tool_msg.content)
+        assert data["path"] == "/var/log/app"
+        assert data["content_preview"].endswith("...")
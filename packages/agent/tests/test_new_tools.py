@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
-from argus_agent.config import reset_settings
 from argus_agent.events.bus import reset_event_bus
 from argus_agent.storage.timeseries import close_timeseries, init_timeseries
 from argus_agent.tools.metrics import SystemMetricsTool
@@ -16,21 +14,19 @@ from argus_agent.tools.process import ProcessListTool
 
 
 @pytest.fixture(autouse=True)
-def _reset():
-    reset_settings()
+def _reset(fresh_settings):
     reset_event_bus()
     yield
-    reset_settings()
     reset_event_bus()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def _ts_db():
-    with tempfile.TemporaryDirectory() as d:
-        db_path = str(Path(d) / "test_ts.duckdb")
-        init_timeseries(db_path)
-        yield
-        close_timeseries()
+    # These tests only read, so one in-memory DuckDB serves the whole module.
+    # Module (not session) scope: other modules open and close the global connection.
+    init_timeseries(":memory:")
+    yield
+    close_timeseries()
 
 
 class TestSystemMetricsTool:
@@ -70,6 +66,30 @@ class TestSystemMetricsTool:
         assert "metric" in defn.parameters["properties"]
 
 
+_FAKE_PROCESSES = [
+    SimpleNamespace(info={
+        "pid": 1234 + i,
+        "name": name,
+        "status": "sleeping",
+        "cpu_percent": float(i),
+        "memory_percent": 0.5,
+        "username": "argus",
+        "cmdline": [name, "--flag"],
+    })
+    for i, name in enumerate(["bash", "python", "postgres"] * 4)
+]
+
+
+@pytest.fixture()
+def _fake_process_table(monkeypatch):
+    """Serve a fixed process table instead of shelling out to ps or walking /proc."""
+    import argus_agent.collectors.process_monitor as pm
+
+    monkeypatch.setattr(pm, "_get_process_list_ps", lambda: None)
+    monkeypatch.setattr(pm.psutil, "process_iter", lambda attrs=None: iter(_FAKE_PROCESSES))
+
+
+@pytest.mark.usefixtures("_fake_process_table")
 class TestProcessListTool:
     @pytest.mark.asyncio
     async def test_list_processes(self):
@@ -81,6 +101,8 @@ class TestProcessListTool:
         assert len(result["processes"]) > 0
         assert "pid" in result["processes"][0]
         assert result["display_type"] == "process_table"
+        # Default sort is by CPU, highest first
+        assert result["processes"][0]["cpu_percent"] == 11.0
 
     @pytest.mark.asyncio
     async def test_returns_all_processes(self):
@@ -89,7 +111,7 @@ class TestProcessListTool:
 
         # Should return all processes, no artificial limit
         assert result["total_processes"] == len(result["processes"])
-        assert result["total_processes"] > 10
+        assert result["total_processes"] == len(_FAKE_PROCESSES)
 
     def test_tool_properties(self):
         tool = ProcessListTool()
@@ -2,33 +2,60 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 
-from argus_agent.storage.models import Base
+from argus_agent.alerting.settings import NotificationSettingsService
+
+pytestmark = pytest.mark.usefixtures("_init_db")
+
+
+# Built once for the module and reset between tests
+_reload_stub = AsyncMock(return_value=None)
+_slack_test_stub = AsyncMock(return_value={"ok": True, "team": "TestTeam", "bot": "argus-bot"})
+_slack_list_stub = AsyncMock(
+    return_value=[{"id": "C1", "name": "general"}, {"id": "C2", "name": "alerts"}],
+)
+_email_test_stub = AsyncMock(return_value={"ok": True, "to": ["c@d.com"]})
+
+
+@pytest.fixture(autouse=True)
+def _mock_reload(monkeypatch):
+    """Stub reload_channels since there's no running AlertEngine."""
+    _reload_stub.reset_mock()
+    monkeypatch.setattr("argus_agent.alerting.reload.reload_channels", _reload_stub)
 
 
 @pytest.fixture()
-async def client(monkeypatch):
-    """Create a test client with in-memory DB."""
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
-    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+def _mock_channels(monkeypatch):
+    """Install stubs for the network-facing channel methods."""
+    for stub in (_slack_test_stub, _slack_list_stub, _email_test_stub):
+        stub.reset_mock()
+    monkeypatch.setattr(
+        "argus_agent.alerting.channels.SlackChannel.test_connection", _slack_test_stub,
+    )
+    monkeypatch.setattr(
+        "argus_agent.alerting.channels.SlackChannel.list_channels", _slack_list_stub,
+    )
+    monkeypatch.setattr(
+        "argus_agent.alerting.channels.EmailChannel.test_connection", _email_test_stub,
+    )
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
 
-    import argus_agent.storage.database as db_mod
-    import argus_agent.storage.repositories as repo_mod
-    from argus_agent.storage.sqlite_operational import SQLiteOperationalRepository
+@pytest.fixture()
+async def _slack_configured(_init_db):
+    """Seed a Slack config directly; the PUT route has its own test."""
+    await NotificationSettingsService().upsert(
+        "slack", True, {"bot_token": "xoxb-test", "channel_id": "C123"},
+    )
 
-    monkeypatch.setattr(db_mod, "_session_factory", factory)
-    monkeypatch.setattr(repo_mod, "_operational_repo", SQLiteOperationalRepository())
 
-    # Import the app and create test client
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client():
+    """One test client for the module; each test gets its own DB transaction."""
     from fastapi import FastAPI
 
     from argus_agent.api.rest import router
@@ -40,8 +67,6 @@ async def client(monkeypatch):
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
-    await engine.dispose()
-
 
 @pytest.mark.asyncio
 async def test_get_notification_settings_empty(client):
@@ -53,21 +78,20 @@ async def test_get_notification_settings_empty(client):
 
 @pytest.mark.asyncio
 async def test_upsert_notification_setting(client):
-    # Mock reload_channels since there's no running AlertEngine
-    with patch("argus_agent.alerting.reload.reload_channels", new_callable=AsyncMock):
-        r = await client.put(
-            "/api/v1/notifications/settings/slack",
-            json={
-                "enabled": True,
-                "config": {"bot_token": "xoxb-test", "channel_id": "C123"},
-            },
-        )
+    r = await client.put(
+        "/api/v1/notifications/settings/slack",
+        json={
+            "enabled": True,
+            "config": {"bot_token": "xoxb-test", "channel_id": "C123"},
+        },
+    )
     assert r.status_code == 200
     data = r.json()
     assert data["channel_type"] == "slack"
     assert data["enabled"] is True
     # Token should be masked in response
     assert data["config"]["bot_token"] == "••••••••"
+    _reload_stub.assert_awaited_once_with(force=True)
 
 
 @pytest.mark.asyncio
@@ -86,50 +110,31 @@ async def test_test_notification_not_configured(client):
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("_mock_channels", "_slack_configured")
 async def test_test_slack_notification(client):
-    # First, create the config
-    with patch("argus_agent.alerting.reload.reload_channels", new_callable=AsyncMock):
-        await client.put(
-            "/api/v1/notifications/settings/slack",
-            json={
-                "enabled": True,
-                "config": {"bot_token": "xoxb-test", "channel_id": "C123"},
-            },
-        )
-
-    # Test notification — mock SlackChannel.test_connection
-    with patch(
-        "argus_agent.alerting.channels.SlackChannel.test_connection",
-        new_callable=AsyncMock,
-        return_value={"ok": True, "team": "TestTeam", "bot": "argus-bot"},
-    ):
-        r = await client.post("/api/v1/notifications/test/slack")
+    r = await client.post("/api/v1/notifications/test/slack")
     assert r.status_code == 200
     assert r.json()["ok"] is True
+    _slack_test_stub.assert_awaited_once()
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("_mock_channels")
 async def test_test_email_notification(client):
-    with patch("argus_agent.alerting.reload.reload_channels", new_callable=AsyncMock):
-        await client.put(
-            "/api/v1/notifications/settings/email",
-            json={
-                "enabled": True,
-                "config": {
-                    "smtp_host": "smtp.test.com",
-                    "smtp_port": 587,
-                    "from_addr": "a@b.com",
-                    "to_addrs": ["c@d.com"],
-                },
+    await client.put(
+        "/api/v1/notifications/settings/email",
+        json={
+            "enabled": True,
+            "config": {
+                "smtp_host": "smtp.test.com",
+                "smtp_port": 587,
+                "from_addr": "a@b.com",
+                "to_addrs": ["c@d.com"],
             },
-        )
-
-    with patch(
-        "argus_agent.alerting.channels.EmailChannel.test_connection",
-        new_callable=AsyncMock,
-        return_value={"ok": True, "to": ["c@d.com"]},
-    ):
-        r = await client.post("/api/v1/notifications/test/email")
+        },
+    )
+
+    r = await client.post("/api/v1/notifications/test/email")
     assert r.status_code == 200
     assert r.json()["ok"] is True
 
@@ -141,22 +146,9 @@ async def test_list_slack_channels_not_configured(client):
 
 
 @pytest.mark.asyncio
+@pytest.mark.usefixtures("_mock_channels", "_slack_configured")
 async def test_list_slack_channels(client):
-    with patch("argus_agent.alerting.reload.reload_channels", new_callable=AsyncMock):
-        await client.put(
-            "/api/v1/notifications/settings/slack",
-            json={
-                "enabled": True,
-                "config": {"bot_token": "xoxb-test", "channel_id": "C123"},
-            },
-        )
-
-    with patch(
-        "argus_agent.alerting.channels.SlackChannel.list_channels",
-        new_callable=AsyncMock,
-        return_value=[{"id": "C1", "name": "general"}, {"id": "C2", "name": "alerts"}],
-    ):
-        r = await client.get("/api/v1/notifications/slack/channels")
+    r = await client.get("/api/v1/notifications/slack/channels")
     assert r.status_code == 200
     data = r.json()
     assert len(data["channels"]) == 2
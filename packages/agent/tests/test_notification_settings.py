@@ -3,34 +3,24 @@
 from __future__ import annotations
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from argus_agent.alerting.settings import _MASK, NotificationSettingsService
 from argus_agent.config import AlertConfig
-from argus_agent.storage.models import Base
 
 
-@pytest.fixture()
-async def _init_db(monkeypatch):
-    """Create an in-memory SQLite database for tests."""
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
-    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+@pytest.fixture
+def commits(monkeypatch) -> list[AsyncSession]:
+    """Record every session commit made during the test."""
+    seen: list[AsyncSession] = []
+    real_commit = AsyncSession.commit
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    async def _commit(self: AsyncSession) -> None:
+        seen.append(self)
+        await real_commit(self)
 
-    # Monkey-patch get_session to use our in-memory DB
-    import argus_agent.storage.database as db_mod
-    import argus_agent.storage.repositories as repo_mod
-    from argus_agent.storage.sqlite_operational import SQLiteOperationalRepository
-
-    monkeypatch.setattr(db_mod, "_session_factory", factory)
-    monkeypatch.setattr(repo_mod, "_operational_repo", SQLiteOperationalRepository())
-
-    yield
-
-    await engine.dispose()
+    monkeypatch.setattr(AsyncSession, "commit", _commit)
+    return seen
 
 
 @pytest.mark.asyncio
@@ -62,16 +52,84 @@ async def test_secret_masking():
 @pytest.mark.usefixtures("_init_db")
 async def test_upsert_preserves_masked_secrets():
     svc = NotificationSettingsService()
-    await svc.upsert("slack", True, {"bot_token": "xoxb-original", "channel_id": "C1"})
+    async with svc.transactional():
+        await svc.upsert("slack", True, {"bot_token": "xoxb-original", "channel_id": "C1"})
 
-    # Simulate UI sending back masked token
-    await svc.upsert("slack", True, {"bot_token": _MASK, "channel_id": "C2"})
+        # Simulate UI sending back masked token
+        await svc.upsert("slack", True, {"bot_token": _MASK, "channel_id": "C2"})
 
     raw = await svc.get_all_raw()
     assert raw[0]["config"]["bot_token"] == "xoxb-original"
     assert raw[0]["config"]["channel_id"] == "C2"
 
 
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_init_db")
+async def test_nested_transactional_joins_outer(commits):
+    svc = NotificationSettingsService()
+    async with svc.transactional():
+        outer = svc._session
+        async with svc.transactional():
+            await svc.upsert("webhook", True, {"urls": ["https://example.com/a"]})
+        # The inner block neither committed nor detached the shared session
+        assert svc._session is outer
+        assert commits == []
+        await svc.upsert("slack", True, {"channel_id": "C1"})
+
+    assert commits == [outer]
+    assert svc._session is None
+    assert {c["channel_type"] for c in await svc.get_all()} == {"slack", "webhook"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_init_db")
+async def test_reads_do_not_commit(commits):
+    svc = NotificationSettingsService()
+    await svc.get_all()
+    await svc.get_by_type("slack")
+    assert commits == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_init_db")
+async def test_upsert_many():
+    svc = NotificationSettingsService()
+    await svc.upsert("slack", True, {"bot_token": "xoxb-original", "channel_id": "C1"})
+
+    results = await svc.upsert_many([
+        ("slack", False, {"bot_token": _MASK, "channel_id": "C2"}),
+        ("webhook", True, {"urls": ["https://example.com/hook"]}),
+    ])
+    assert [r["channel_type"] for r in results] == ["slack", "webhook"]
+    assert results[0]["config"]["bot_token"] == _MASK
+
+    raw = {c["channel_type"]: c for c in await svc.get_all_raw()}
+    assert raw["slack"]["enabled"] is False
+    assert raw["slack"]["config"] == {"bot_token": "xoxb-original", "channel_id": "C2"}
+    assert raw["webhook"]["enabled"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_init_db")
+async def test_upsert_many_inside_transactional(commits):
+    svc = NotificationSettingsService()
+    async with svc.transactional():
+        outer = svc._session
+        await svc.upsert_many([
+            ("slack", True, {"channel_id": "C1"}),
+            ("webhook", True, {"urls": ["https://example.com/hook"]}),
+        ])
+        assert svc._session is outer
+        await svc.initialize_from_config(AlertConfig(webhook_urls=["https://example.com/other"]))
+        assert svc._session is outer
+
+    assert commits == [outer]
+    raw = {c["channel_type"]: c for c in await svc.get_all_raw()}
+    assert set(raw) == {"slack", "webhook"}
+    # The seed saw the row written earlier in the same transaction
+    assert raw["webhook"]["config"]["urls"] == ["https://example.com/hook"]
+
+
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("_init_db")
 async def test_get_by_type():
@@ -2,20 +2,44 @@
 
 from __future__ import annotations
 
-import json
+import functools
+import sys
 from dataclasses import dataclass, field
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+import argus_agent.llm.openai as openai_provider_mod
 from argus_agent.config import LLMConfig
 from argus_agent.llm.base import LLMError, LLMMessage, ToolDefinition
 
 # --- Helpers ---
 
 
+@pytest.fixture(scope="module")
+def openai_mod():
+    """The provider module with a stub ``openai`` package installed.
+
+    ``openai`` is imported lazily inside ``OpenAIProvider.__init__``, so the
+    stub only has to be present in ``sys.modules``; no module reload needed.
+    """
+    stub = MagicMock()
+    # _is_retryable() does isinstance checks against these
+    stub.RateLimitError = type("RateLimitError", (Exception,), {})
+    stub.APIConnectionError = type("APIConnectionError", (Exception,), {})
+    with patch.dict(sys.modules, {"openai": stub}):
+        yield openai_provider_mod
+
+
 def _make_config(**overrides: Any) -> LLMConfig:
+    # Configs are read-only in these tests, so identical overrides share one instance
+    return _cached_config(tuple(sorted(overrides.items())))
+
+
+@functools.cache
+def _cached_config(overrides: tuple[tuple[str, Any], ...]) -> LLMConfig:
     defaults = {"provider": "openai", "model": "gpt-4o", "api_key": "test-key"}
     defaults.update(overrides)
     return LLMConfig(**defaults)
@@ -177,378 +201,222 @@ def test_parse_tool_calls():
 # --- Provider init ---
 
 
-def test_openai_provider_properties():
-    mock_module = MagicMock()
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-        assert provider.name == "openai"
-        assert provider.max_context_tokens == 128_000
-
-
-def test_openai_unknown_model_context():
-    mock_module = MagicMock()
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
+def test_openai_provider_properties(openai_mod):
+    provider = openai_mod.OpenAIProvider(_make_config())
+    assert provider.name == "openai"
+    assert provider.max_context_tokens == 128_000
 
-        import argus_agent.llm.openai as mod
 
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config(model="gpt-future"))
-        assert provider.max_context_tokens == 128_000
+def test_openai_unknown_model_context(openai_mod):
+    provider = openai_mod.OpenAIProvider(_make_config(model="gpt-future"))
+    assert provider.max_context_tokens == 128_000
 
 
 # --- Complete ---
 
-
-@pytest.mark.asyncio
-async def test_openai_complete_text_response():
-    """complete() returns text content from response."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        return_value=_Response(
-            choices=[_Choice(message=_Message(content="Hello world"))],
-        )
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
-    msgs = [LLMMessage(role="user", content="Hi")]
-    result = await provider.complete(msgs)
-
-    assert result.content == "Hello world"
-    assert result.finish_reason == "stop"
-    assert result.prompt_tokens == 100
-    assert result.completion_tokens == 50
-
-
-@pytest.mark.asyncio
-async def test_openai_complete_with_tool_calls():
-    """complete() parses tool call objects."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        return_value=_Response(
-            choices=[_Choice(
-                message=_Message(
-                    tool_calls=[
-                        _ToolCall(
-                            id="tc_1",
-                            function=_Function(name="get_metrics", arguments='{"limit": 5}'),
-                        ),
-                    ],
-                ),
-                finish_reason="tool_calls",
-            )],
-        )
+_TOOLS = [
+    ToolDefinition(name="get_metrics", description="Get metrics", parameters={"type": "object"}),
+]
+_GET_METRICS_CALL = {
+    "id": "tc_1",
+    "type": "function",
+    "function": {"name": "get_metrics", "arguments": '{"limit": 5}'},
+}
+
+
+def _make_client(
+    return_value: Any = None, side_effect: Exception | None = None,
+) -> SimpleNamespace:
+    """A minimal async OpenAI client stub that records ``create`` kwargs in ``calls``."""
+    calls: list[dict[str, Any]] = []
+
+    async def create(**kwargs: Any) -> Any:
+        calls.append(kwargs)
+        if side_effect is not None:
+            raise side_effect
+        return return_value
+
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create)),
+        calls=calls,
     )
 
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
-    tools = [ToolDefinition(
-        name="get_metrics", description="Get metrics",
-        parameters={"type": "object"},
-    )]
-    msgs = [LLMMessage(role="user", content="metrics")]
-    result = await provider.complete(msgs, tools=tools)
-
-    assert len(result.tool_calls) == 1
-    tc = result.tool_calls[0]
-    assert tc["function"]["name"] == "get_metrics"
-    assert json.loads(tc["function"]["arguments"]) == {"limit": 5}
-    assert result.finish_reason == "tool_calls"
-
-
-@pytest.mark.asyncio
-async def test_openai_complete_empty_choices():
-    """complete() handles empty choices list gracefully."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        return_value=_Response(choices=[]),
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
 
-        import argus_agent.llm.openai as mod
+def _make_provider(openai_mod, client: SimpleNamespace, **config_overrides: Any):
+    """Build a provider that talks to the stub *client*."""
+    provider = openai_mod.OpenAIProvider(_make_config(**config_overrides))
+    provider._client = client
+    return provider
 
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
 
-    provider._client = mock_client
-    msgs = [LLMMessage(role="user", content="Hi")]
-    result = await provider.complete(msgs)
+def _assert_response(response: Any, expected: dict[str, Any]) -> None:
+    for attr, value in expected.items():
+        assert getattr(response, attr) == value, attr
 
-    assert result.finish_reason == "error"
-    assert result.content == ""
 
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize(
+    ("response", "expected"),
+    [
+        pytest.param(
+            _Response(choices=[_Choice(message=_Message(content="Hello world"))]),
+            {
+                "content": "Hello world",
+                "finish_reason": "stop",
+                "prompt_tokens": 100,
+                "completion_tokens": 50,
+            },
+            id="text",
+        ),
+        pytest.param(
+            _Response(choices=[_Choice(
+                message=_Message(tool_calls=[
+                    _ToolCall(
+                        id="tc_1",
+                        function=_Function(name="get_metrics", arguments='{"limit": 5}'),
+                    ),
+                ]),
+                finish_reason="tool_calls",
+            )]),
+            {"tool_calls": [_GET_METRICS_CALL], "finish_reason": "tool_calls"},
+            id="tool_calls",
+        ),
+        # Empty choices are handled gracefully
+        pytest.param(
+            _Response(choices=[]),
+            {"finish_reason": "error", "content": ""},
+            id="empty_choices",
+        ),
+    ],
+)
+async def test_openai_complete(openai_mod, response, expected):
+    """complete() maps the API response onto LLMResponse."""
+    provider = _make_provider(openai_mod, _make_client(response))
+    result = await provider.complete([LLMMessage(role="user", content="Hi")], tools=_TOOLS)
+    _assert_response(result, expected)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize(
+    ("model", "temperature"),
+    [
+        # Models in _FIXED_TEMPERATURE_PREFIXES should not send temperature
+        pytest.param("gpt-5-mini", None, id="fixed_temp_model_omits_temperature"),
+        pytest.param("gpt-4o", 0.1, id="normal_model_includes_temperature"),
+    ],
+)
+async def test_openai_complete_temperature(openai_mod, model, temperature):
+    client = _make_client(_Response(choices=[_Choice(message=_Message(content="ok"))]))
+    provider = _make_provider(openai_mod, client, model=model)
+    await provider.complete([LLMMessage(role="user", content="Hi")])
 
-@pytest.mark.asyncio
-async def test_openai_complete_api_error():
-    """complete() wraps API errors in LLMError."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        side_effect=Exception("API key invalid"),
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
-    msgs = [LLMMessage(role="user", content="Hi")]
-
-    with pytest.raises(LLMError) as exc_info:
-        await provider.complete(msgs)
-    assert exc_info.value.provider == "openai"
-    assert "API key invalid" in str(exc_info.value)
+    call_kwargs = client.calls[-1]
+    if temperature is None:
+        assert "temperature" not in call_kwargs
+    else:
+        assert call_kwargs["temperature"] == temperature
 
 
 # --- Stream ---
 
 
-@pytest.mark.asyncio
-async def test_openai_stream_text_deltas():
-    """stream() yields text deltas and final usage."""
-    chunks = [
-        _StreamChunk(choices=[_StreamChoice(delta=_Delta(content="Hello "))]),
-        _StreamChunk(choices=[_StreamChoice(delta=_Delta(content="world"))]),
-        _StreamChunk(
-            choices=[_StreamChoice(delta=_Delta(), finish_reason="stop")],
-            usage=_Usage(prompt_tokens=80, completion_tokens=20),
+class _AsyncStream:
+    def __init__(self, chunks: tuple[_StreamChunk, ...]) -> None:
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for c in self._chunks:
+            yield c
+
+
+# Two text deltas + one final with usage
+_TEXT_DELTA_CHUNKS = (
+    _StreamChunk(choices=[_StreamChoice(delta=_Delta(content="Hello "))]),
+    _StreamChunk(choices=[_StreamChoice(delta=_Delta(content="world"))]),
+    _StreamChunk(
+        choices=[_StreamChoice(delta=_Delta(), finish_reason="stop")],
+        usage=_Usage(prompt_tokens=80, completion_tokens=20),
+    ),
+)
+
+# One tool call whose arguments are split across two chunks
+_TOOL_CALL_CHUNKS = (
+    _StreamChunk(choices=[_StreamChoice(delta=_Delta(
+        tool_calls=[_DeltaToolCall(
+            index=0,
+            id="tc_1",
+            function=_DeltaFunction(name="get_metrics", arguments='{"li'),
+        )],
+    ))]),
+    _StreamChunk(choices=[_StreamChoice(delta=_Delta(
+        tool_calls=[_DeltaToolCall(
+            index=0,
+            function=_DeltaFunction(arguments='mit": 5}'),
+        )],
+    ))]),
+    _StreamChunk(
+        choices=[_StreamChoice(delta=_Delta(), finish_reason="tool_calls")],
+    ),
+)
+
+# Usage-only chunk with no choices
+_EMPTY_CHUNKS = (_StreamChunk(choices=[]),)
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize(
+    ("chunks", "expected"),
+    [
+        pytest.param(
+            _TEXT_DELTA_CHUNKS,
+            [
+                {"content": "Hello "},
+                {"content": "world"},
+                {"finish_reason": "stop", "prompt_tokens": 80, "completion_tokens": 20},
+            ],
+            id="text_deltas",
         ),
-    ]
-
-    class _AsyncStream:
-        async def __aiter__(self):
-            for c in chunks:
-                yield c
-
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(return_value=_AsyncStream())
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
-
-    responses = []
-    async for r in provider.stream([LLMMessage(role="user", content="Hi")]):
-        responses.append(r)
-
-    # Two text deltas + one final
-    assert len(responses) == 3
-    assert responses[0].content == "Hello "
-    assert responses[1].content == "world"
-    assert responses[2].finish_reason == "stop"
-    assert responses[2].prompt_tokens == 80
-    assert responses[2].completion_tokens == 20
-
-
-@pytest.mark.asyncio
-async def test_openai_stream_tool_calls():
-    """stream() accumulates tool calls across chunks."""
-    chunks = [
-        _StreamChunk(choices=[_StreamChoice(delta=_Delta(
-            tool_calls=[_DeltaToolCall(
-                index=0,
-                id="tc_1",
-                function=_DeltaFunction(name="get_metrics", arguments='{"li'),
-            )],
-        ))]),
-        _StreamChunk(choices=[_StreamChoice(delta=_Delta(
-            tool_calls=[_DeltaToolCall(
-                index=0,
-                function=_DeltaFunction(arguments='mit": 5}'),
-            )],
-        ))]),
-        _StreamChunk(
-            choices=[_StreamChoice(delta=_Delta(), finish_reason="tool_calls")],
+        # Tool calls are accumulated across chunks into the final response only
+        pytest.param(
+            _TOOL_CALL_CHUNKS,
+            [{"finish_reason": "tool_calls", "tool_calls": [_GET_METRICS_CALL]}],
+            id="tool_calls",
         ),
-    ]
-
-    class _AsyncStream:
-        async def __aiter__(self):
-            for c in chunks:
-                yield c
+        # A final response is always yielded, even for a usage-only chunk
+        pytest.param(_EMPTY_CHUNKS, [{"tool_calls": []}], id="empty_yields_final"),
+    ],
+)
+async def test_openai_stream(openai_mod, chunks, expected):
+    """stream() yields text deltas followed by one final response."""
+    provider = _make_provider(openai_mod, _make_client(_AsyncStream(chunks)))
 
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(return_value=_AsyncStream())
+    responses = [r async for r in provider.stream([LLMMessage(role="user", content="Hi")])]
 
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
+    assert len(responses) == len(expected)
+    for response, exp in zip(responses, expected, strict=True):
+        _assert_response(response, exp)
 
-        import argus_agent.llm.openai as mod
 
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
+# --- Errors ---
 
-    provider._client = mock_client
 
-    responses = []
-    async for r in provider.stream([LLMMessage(role="user", content="metrics")]):
-        responses.append(r)
-
-    # Only the final response (no text deltas)
-    assert len(responses) == 1
-    final = responses[0]
-    assert final.finish_reason == "tool_calls"
-    assert len(final.tool_calls) == 1
-    assert final.tool_calls[0]["id"] == "tc_1"
-    assert final.tool_calls[0]["function"]["name"] == "get_metrics"
-    assert json.loads(final.tool_calls[0]["function"]["arguments"]) == {"limit": 5}
-
-
-@pytest.mark.asyncio
-async def test_openai_stream_empty_yields_final():
-    """stream() always yields a final response even with no text or tool calls."""
-    chunks = [
-        _StreamChunk(choices=[]),  # empty choices chunk (usage-only)
-    ]
-
-    class _AsyncStream:
-        async def __aiter__(self):
-            for c in chunks:
-                yield c
-
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(return_value=_AsyncStream())
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
-
-    responses = []
-    async for r in provider.stream([LLMMessage(role="user", content="Hi")]):
-        responses.append(r)
-
-    # Should always yield at least the final response
-    assert len(responses) == 1
-    assert responses[0].tool_calls == []
-
-
-@pytest.mark.asyncio
-async def test_fixed_temp_model_omits_temperature():
-    """Models in _FIXED_TEMPERATURE_PREFIXES should not send temperature."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        return_value=_Response(
-            choices=[_Choice(message=_Message(content="ok"))],
-        )
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config(model="gpt-5-mini"))
-
-    provider._client = mock_client
-    await provider.complete([LLMMessage(role="user", content="Hi")])
-
-    call_kwargs = mock_client.chat.completions.create.call_args[1]
-    assert "temperature" not in call_kwargs
-
-
-@pytest.mark.asyncio
-async def test_normal_model_includes_temperature():
-    """Normal models should include temperature in API params."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        return_value=_Response(
-            choices=[_Choice(message=_Message(content="ok"))],
-        )
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
-
-        import argus_agent.llm.openai as mod
-
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config(model="gpt-4o"))
-
-    provider._client = mock_client
+async def _call_complete(provider: Any) -> None:
     await provider.complete([LLMMessage(role="user", content="Hi")])
 
-    call_kwargs = mock_client.chat.completions.create.call_args[1]
-    assert "temperature" in call_kwargs
-    assert call_kwargs["temperature"] == 0.1
-
 
-@pytest.mark.asyncio
-async def test_openai_stream_api_error():
-    """stream() wraps API errors in LLMError."""
-    mock_client = AsyncMock()
-    mock_client.chat.completions.create = AsyncMock(
-        side_effect=Exception("rate limit exceeded"),
-    )
-
-    mock_module = MagicMock()
-    mock_module.AsyncOpenAI.return_value = mock_client
-    with patch.dict("sys.modules", {"openai": mock_module}):
-        from importlib import reload
+async def _call_stream(provider: Any) -> None:
+    async for _ in provider.stream([LLMMessage(role="user", content="Hi")]):
+        pass
 
-        import argus_agent.llm.openai as mod
 
-        reload(mod)
-        provider = mod.OpenAIProvider(_make_config())
-
-    provider._client = mock_client
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize("call", [_call_complete, _call_stream], ids=["complete", "stream"])
+async def test_openai_api_error(openai_mod, call):
+    """complete() and stream() wrap API errors in LLMError."""
+    client = _make_client(side_effect=Exception("API key invalid"))
+    provider = _make_provider(openai_mod, client)
 
     with pytest.raises(LLMError) as exc_info:
-        async for _ in provider.stream([LLMMessage(role="user", content="Hi")]):
-            pass
+        await call(provider)
     assert exc_info.value.provider == "openai"
+    assert "API key invalid" in str(exc_info.value)
@@ -3,10 +3,9 @@
 from __future__ import annotations
 
 import asyncio
-import json
 
+import orjson
 import pytest
-from fakeredis import aioredis as fakeredis_aioredis
 
 from argus_agent.events.bus import RedisEventBus, reset_event_bus
 from argus_agent.events.types import Event, EventSeverity, EventSource, EventType
@@ -19,13 +18,6 @@ def _reset():
     reset_event_bus()
 
 
-@pytest.fixture
-async def redis():
-    r = fakeredis_aioredis.FakeRedis(decode_responses=True)
-    yield r
-    await r.aclose()
-
-
 class TestRedisEventBus:
     @pytest.mark.asyncio
     async def test_publish_fires_local_handler(self, redis):
@@ -52,19 +44,21 @@ class TestRedisEventBus:
         bus = RedisEventBus(redis)
 
         received = []
+        subscribed = asyncio.Event()
 
         async def _listen():
             pubsub = redis.pubsub()
             await pubsub.subscribe("argus:events")
+            subscribed.set()
             async for msg in pubsub.listen():
                 if msg["type"] == "message":
-                    received.append(json.loads(msg["data"]))
+                    received.append(orjson.loads(msg["data"]))
                     break
             await pubsub.unsubscribe()
             await pubsub.aclose()
 
         listener = asyncio.create_task(_listen())
-        await asyncio.sleep(0.05)
+        await asyncio.wait_for(subscribed.wait(), timeout=1)
 
         event = Event(
             source=EventSource.SYSTEM_METRICS,
@@ -78,21 +72,23 @@ class TestRedisEventBus:
         assert len(received) == 1
         assert received[0]["type"] == EventType.CPU_HIGH
         assert received[0]["severity"] == "URGENT"
+        assert received[0]["timestamp"] == event.timestamp.isoformat()
 
     @pytest.mark.asyncio
-    async def test_subscribe_fires_local_for_remote_events(self):
+    async def test_subscribe_fires_local_for_remote_events(self, redis):
         """Events from Redis should be delivered to local handlers."""
-        redis = fakeredis_aioredis.FakeRedis(decode_responses=True)
         bus = RedisEventBus(redis)
 
         received = []
+        delivered = asyncio.Event()
 
         async def handler(event: Event):
             received.append(event)
+            delivered.set()
 
         bus.subscribe(handler)
         await bus.start()
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(bus._subscribed.wait(), timeout=1)
 
         # Simulate a remote event by publishing directly to Redis
         remote_event = {
@@ -103,19 +99,17 @@ class TestRedisEventBus:
             "message": "remote burst",
             "timestamp": "2024-01-01T00:00:00+00:00",
         }
-        await redis.publish("argus:events", json.dumps(remote_event))
-        await asyncio.sleep(0.2)
+        await redis.publish("argus:events", orjson.dumps(remote_event))
+        await asyncio.wait_for(delivered.wait(), timeout=1)
 
         assert len(received) >= 1
         assert received[-1].message == "remote burst"
 
         bus.stop()
-        await redis.aclose()
 
     @pytest.mark.asyncio
-    async def test_no_republish_loop(self):
+    async def test_no_republish_loop(self, redis):
         """Events from Redis should NOT be re-published to Redis."""
-        redis = fakeredis_aioredis.FakeRedis(decode_responses=True)
         bus = RedisEventBus(redis)
 
         publish_count = 0
@@ -128,8 +122,14 @@ class TestRedisEventBus:
 
         redis.publish = counting_publish
 
+        delivered = asyncio.Event()
+
+        async def handler(event: Event):
+            delivered.set()
+
+        bus.subscribe(handler)
         await bus.start()
-        await asyncio.sleep(0.1)
+        await asyncio.wait_for(bus._subscribed.wait(), timeout=1)
 
         # Publish directly (simulating remote)
         remote_event = {
@@ -140,14 +140,14 @@ class TestRedisEventBus:
             "message": "test",
             "timestamp": "2024-01-01T00:00:00+00:00",
         }
-        await original_publish("argus:events", json.dumps(remote_event))
-        await asyncio.sleep(0.2)
+        await original_publish("argus:events", orjson.dumps(remote_event))
+        await asyncio.wait_for(delivered.wait(), timeout=1)
+        await asyncio.sleep(0)  # let any (unwanted) re-publish run
 
         # Only the original publish should have happened (count == 1)
         assert publish_count <= 1
 
         bus.stop()
-        await redis.aclose()
 
     @pytest.mark.asyncio
     async def test_recent_events_tracked(self, redis):
@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import patch
 
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
 
+from argus_agent.alerting import reload as reload_mod
 from argus_agent.alerting.channels import (
     EmailChannel,
     SlackChannel,
@@ -16,139 +18,109 @@ from argus_agent.alerting.channels import (
 )
 from argus_agent.alerting.reload import reload_channels
 from argus_agent.alerting.settings import NotificationSettingsService
-from argus_agent.storage.models import Base
 
+_SLACK = {"bot_token": "xoxb-t", "channel_id": "C1"}
+_EMAIL = {
+    "smtp_host": "smtp.test.com",
+    "smtp_port": 587,
+    "from_addr": "a@b.com",
+    "to_addrs": ["c@d.com"],
+}
+_WEBHOOK = {"urls": ["https://example.com/hook"]}
 
-@pytest.fixture()
-async def _init_db(monkeypatch):
-    engine = create_async_engine("sqlite+aiosqlite://", echo=False)
-    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
 
-    import argus_agent.storage.database as db_mod
-    import argus_agent.storage.repositories as repo_mod
-    from argus_agent.storage.sqlite_operational import SQLiteOperationalRepository
+async def _seed(rows: list[tuple[str, bool, dict[str, Any]]]) -> None:
+    """Store ``(channel_type, enabled, config)`` rows in one transaction."""
+    await NotificationSettingsService().upsert_many(rows)
 
-    monkeypatch.setattr(db_mod, "_session_factory", factory)
-    monkeypatch.setattr(repo_mod, "_operational_repo", SQLiteOperationalRepository())
-    yield
-    await engine.dispose()
 
+@pytest.fixture()
+def alert_patches():
+    """Patch in a stub alert engine and formatter.
 
-@pytest.mark.asyncio
-@pytest.mark.usefixtures("_init_db")
-async def test_reload_creates_channels_from_db():
-    # Seed some configs
-    svc = NotificationSettingsService()
-    await svc.upsert("slack", True, {"bot_token": "xoxb-t", "channel_id": "C1"})
-    await svc.upsert("email", True, {
-        "smtp_host": "smtp.test.com",
-        "smtp_port": 587,
-        "from_addr": "a@b.com",
-        "to_addrs": ["c@d.com"],
-    })
-    await svc.upsert("webhook", True, {"urls": ["https://example.com/hook"]})
-
-    mock_engine = MagicMock()
+    Yields the ``(engine_channels, formatter_channels)`` lists that their
+    ``set_channels`` calls are captured into.
+    """
     engine_channels: list = []
-    mock_engine.set_channels = lambda ch: engine_channels.extend(ch)
-
-    mock_formatter = MagicMock()
     formatter_channels: list = []
-    mock_formatter.set_channels = lambda ch: formatter_channels.extend(ch)
-
-    mock_manager = AsyncMock()
-
-    with (
-        patch("argus_agent.main._get_alert_engine", return_value=mock_engine),
-        patch("argus_agent.main._get_alert_formatter", return_value=mock_formatter),
-        patch("argus_agent.api.ws.manager", mock_manager),
+    # reload_channels() only ever calls set_channels() on these
+    engine = SimpleNamespace(set_channels=engine_channels.extend)
+    formatter = SimpleNamespace(set_channels=formatter_channels.extend)
+
+    # The websocket manager is only stored on WebSocketChannel, so it needs no stub
+    with patch.multiple(
+        "argus_agent.main",
+        _get_alert_engine=lambda: engine,
+        _get_alert_formatter=lambda: formatter,
     ):
-        await reload_channels(force=True)
+        yield engine_channels, formatter_channels
 
-    # Engine gets only WebSocket
-    assert len(engine_channels) == 1
-    assert isinstance(engine_channels[0], WebSocketChannel)
 
-    # Formatter gets external channels: Slack + Email + Webhook = 3
-    assert len(formatter_channels) == 3
-    types = {type(c) for c in formatter_channels}
-    assert SlackChannel in types
-    assert EmailChannel in types
-    assert WebhookChannel in types
+@pytest.mark.usefixtures("_init_db")
+@pytest.mark.parametrize(
+    ("rows", "formatter_types"),
+    [
+        pytest.param(
+            [("slack", True, _SLACK), ("email", True, _EMAIL), ("webhook", True, _WEBHOOK)],
+            [SlackChannel, EmailChannel, WebhookChannel],
+            id="creates_channels_from_db",
+        ),
+        pytest.param(
+            [("slack", False, _SLACK), ("email", True, _EMAIL)],
+            [EmailChannel],
+            id="skips_disabled_channels",
+        ),
+        # Nothing seeded, so nothing is external
+        pytest.param([], [], id="always_includes_websocket"),
+    ],
+)
+async def test_reload_channels(alert_patches, rows, formatter_types):
+    await _seed(rows)
 
+    engine_channels, formatter_channels = alert_patches
+    await reload_channels(force=True)
 
-@pytest.mark.asyncio
-@pytest.mark.usefixtures("_init_db")
-async def test_reload_skips_disabled_channels():
-    svc = NotificationSettingsService()
-    await svc.upsert("slack", False, {"bot_token": "xoxb-t", "channel_id": "C1"})
-    await svc.upsert("email", True, {
-        "smtp_host": "smtp.test.com",
-        "smtp_port": 587,
-        "from_addr": "a@b.com",
-        "to_addrs": ["c@d.com"],
-    })
-
-    mock_engine = MagicMock()
-    engine_channels: list = []
-    mock_engine.set_channels = lambda ch: engine_channels.extend(ch)
+    # The engine only ever gets the WebSocket channel
+    assert [type(c) for c in engine_channels] == [WebSocketChannel]
 
-    mock_formatter = MagicMock()
-    formatter_channels: list = []
-    mock_formatter.set_channels = lambda ch: formatter_channels.extend(ch)
+    # External channels go to the formatter, one per enabled config
+    assert len(formatter_channels) == len(formatter_types)
+    assert {type(c) for c in formatter_channels} == set(formatter_types)
 
-    mock_manager = AsyncMock()
 
-    with (
-        patch("argus_agent.main._get_alert_engine", return_value=mock_engine),
-        patch("argus_agent.main._get_alert_formatter", return_value=mock_formatter),
-        patch("argus_agent.api.ws.manager", mock_manager),
-    ):
-        await reload_channels(force=True)
+@pytest.mark.usefixtures("_init_db")
+async def test_concurrent_reloads_are_coalesced(alert_patches):
+    engine_channels, _ = alert_patches
+    await asyncio.gather(*(reload_channels(force=True) for _ in range(5)))
 
-    # Engine: WebSocket only
+    # One debounced reload, so set_channels() ran once
     assert len(engine_channels) == 1
-    assert isinstance(engine_channels[0], WebSocketChannel)
 
-    # Formatter: Email only (Slack disabled)
-    assert len(formatter_channels) == 1
-    types = {type(c) for c in formatter_channels}
-    assert EmailChannel in types
-    assert SlackChannel not in types
 
-
-@pytest.mark.asyncio
 @pytest.mark.usefixtures("_init_db")
-async def test_reload_always_includes_websocket():
-    mock_engine = MagicMock()
-    engine_channels: list = []
-    mock_engine.set_channels = lambda ch: engine_channels.extend(ch)
+async def test_cached_reload_runs_once_per_window(alert_patches, monkeypatch):
+    monkeypatch.setattr(reload_mod, "_last_reload_time", float("-inf"))
+    engine_channels, _ = alert_patches
+    await asyncio.gather(*(reload_channels() for _ in range(5)))
+    await reload_channels()
 
-    mock_formatter = MagicMock()
-    formatter_channels: list = []
-    mock_formatter.set_channels = lambda ch: formatter_channels.extend(ch)
-
-    mock_manager = AsyncMock()
+    # The first caller reloaded; the rest were inside the cache window
+    assert len(engine_channels) == 1
 
-    with (
-        patch("argus_agent.main._get_alert_engine", return_value=mock_engine),
-        patch("argus_agent.main._get_alert_formatter", return_value=mock_formatter),
-        patch("argus_agent.api.ws.manager", mock_manager),
-    ):
-        await reload_channels(force=True)
 
-    # Even with no DB configs, WebSocket is always present on engine
+@pytest.mark.usefixtures("_init_db")
+async def test_pending_reload_from_another_loop_is_ignored(alert_patches, monkeypatch):
+    other_loop = asyncio.new_event_loop()
+    try:
+        stale = other_loop.create_future()  # never completes
+        monkeypatch.setattr(reload_mod, "_pending_reload", stale)
+        engine_channels, _ = alert_patches
+        await asyncio.wait_for(reload_channels(force=True), timeout=5)
+    finally:
+        other_loop.close()
     assert len(engine_channels) == 1
-    assert isinstance(engine_channels[0], WebSocketChannel)
-
-    # No external channels
-    assert len(formatter_channels) == 0
 
 
-@pytest.mark.asyncio
 async def test_reload_no_engine_is_noop():
     """reload_channels should not crash if AlertEngine isn't initialised."""
     with patch("argus_agent.main._get_alert_engine", return_value=None):
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, patch
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 
@@ -10,6 +11,19 @@ from argus_agent.actions.sandbox import DEFAULT_RISK, RISK_PATTERNS, _BLOCKLIST_
 from argus_agent.tools.base import ToolRisk
 
 
+def _fake_proc(
+    stdout: bytes = b"output", returncode: int = 0, error: Exception | None = None,
+):
+    """A stand-in for the process returned by ``create_subprocess_exec``."""
+
+    async def communicate() -> tuple[bytes, bytes]:
+        if error is not None:
+            raise error
+        return stdout, b""
+
+    return SimpleNamespace(communicate=communicate, returncode=returncode, kill=lambda: None)
+
+
 class TestCommandSandbox:
     def setup_method(self):
         self.sandbox = CommandSandbox()
@@ -118,6 +132,20 @@ class TestCommandSandbox:
         """rm -rf / with trailing slash variation."""
         assert _is_blocked("rm -rf /") is True
 
+    def test_blocklist_regex_matches_globs(self):
+        """The combined blocklist regex agrees with matching each glob on its own."""
+        from fnmatch import fnmatch
+
+        commands = [
+            "mkfs.ext4 /dev/sda1", "dd if=/dev/zero of=/dev/sda", "dd of=x", "fdisk -l",
+            "> /dev/sda", "chmod 777 /", "chmod 777 /tmp", "iptables -F", "iptables -L",
+            "sysctl -w vm.swappiness=10", "sysctl -a", "rmmod foo", "grub-install /dev/sda",
+            "ls -la", "echo mkfs", "",
+        ]
+        for cmd_str in commands:
+            expected = any(fnmatch(cmd_str, p) for p in _BLOCKLIST_PATTERNS)
+            assert _is_blocked(cmd_str) is expected, cmd_str
+
     def test_rm_user_path_not_blocked(self):
         """rm -rf on a user path like /tmp/junk should NOT be blocked."""
         allowed, risk = self.sandbox.validate_command(["rm", "-rf", "/tmp/junk"])
@@ -130,6 +158,34 @@ class TestCommandSandbox:
         assert allowed is True
         assert risk == ToolRisk.LOW
 
+    def test_custom_risk_patterns_first_match_wins(self):
+        # A wildcard-first-word pattern listed earlier beats a later literal one
+        sandbox = CommandSandbox(risk_patterns={
+            "l*": ToolRisk.HIGH,
+            "ls *": ToolRisk.READ_ONLY,
+            "cat *": ToolRisk.READ_ONLY,
+        })
+        assert sandbox.validate_command(["ls", "-la"]) == (True, ToolRisk.HIGH)
+        assert sandbox.validate_command(["cat", "x"]) == (True, ToolRisk.READ_ONLY)
+
+    def test_risk_index_matches_linear_scan(self):
+        """The first-word index classifies exactly like scanning every pattern."""
+        from fnmatch import fnmatch
+
+        commands = [
+            "ls", "ls -la /tmp", "lsblk", "lsblk -f", "uptime", "uptime -p",
+            "docker ps", "docker ps -a", "docker compose ps", "docker-compose ps",
+            "docker exec web ls", "find / -delete", "find /tmp -exec rm {} ;",
+            "date", "dates", "id", "idle", "init 0", "init 3", "top -b -n 1",
+            "cat /proc/meminfo", "kill -9 1", "rm -r /tmp/x", "htop", "",
+        ]
+        for cmd_str in commands:
+            expected = next(
+                (risk for pattern, risk in RISK_PATTERNS.items() if fnmatch(cmd_str, pattern)),
+                DEFAULT_RISK,
+            )
+            assert self.sandbox.validate_command(cmd_str.split(" ")) == (True, expected), cmd_str
+
     # -- Execution tests --
 
     @pytest.mark.asyncio
@@ -140,12 +196,7 @@ class TestCommandSandbox:
 
     @pytest.mark.asyncio
     async def test_execute_success(self):
-        mock_proc = AsyncMock()
-        mock_proc.communicate = AsyncMock(return_value=(b"output", b""))
-        mock_proc.returncode = 0
-        mock_proc.kill = AsyncMock()
-
-        with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
+        with patch("asyncio.create_subprocess_exec", return_value=_fake_proc()):
             result = await self.sandbox.execute(["echo", "hello"])
             assert result.exit_code == 0
             assert result.stdout == "output"
@@ -153,27 +204,19 @@ class TestCommandSandbox:
     @pytest.mark.asyncio
     async def test_execute_unknown_command(self):
         """Unknown commands (not blocklisted) should execute successfully."""
-        mock_proc = AsyncMock()
-        mock_proc.communicate = AsyncMock(return_value=(b"data", b""))
-        mock_proc.returncode = 0
-        mock_proc.kill = AsyncMock()
-
-        with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
+        with patch("asyncio.create_subprocess_exec", return_value=_fake_proc(b"data")):
             result = await self.sandbox.execute(["htop", "-n", "1"])
             assert result.exit_code == 0
             assert result.stdout == "data"
 
     @pytest.mark.asyncio
     async def test_execute_timeout(self):
-        mock_proc = AsyncMock()
-        mock_proc.communicate = AsyncMock(side_effect=TimeoutError())
-        mock_proc.kill = AsyncMock()
-
-        with patch("asyncio.create_subprocess_exec", return_value=mock_proc):
-            with patch("asyncio.wait_for", side_effect=TimeoutError()):
-                result = await self.sandbox.execute(["echo", "hello"], timeout=1)
-                assert result.exit_code == -1
-                assert "timed out" in result.stderr.lower()
+        # Raising from communicate() is what wait_for() surfaces when the timeout hits
+        proc = _fake_proc(error=TimeoutError())
+        with patch("asyncio.create_subprocess_exec", return_value=proc):
+            result = await self.sandbox.execute(["echo", "hello"], timeout=1)
+            assert result.exit_code == -1
+            assert "timed out" in result.stderr.lower()
 
     def test_blocklist_has_entries(self):
         assert len(_BLOCKLIST_PATTERNS) > 5
@@ -20,35 +20,90 @@ def _reset():
     reset_event_bus()
 
 
+async def _settle() -> None:
+    """Let woken tasks run until they park in their next sleep."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class FakeClock:
+    """Virtual time for the scheduler: sleeps park until ``advance()`` reaches them."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self._sleepers: list[tuple[float, asyncio.Future[None]]] = []
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._sleepers.append((self.now + seconds, future))
+        await future
+
+    async def advance(self, seconds: float) -> None:
+        """Move time forward, waking every sleeper that falls due on the way."""
+        target = self.now + seconds
+        await _settle()
+        while due := [s for s in self._sleepers if s[0] <= target]:
+            self.now = min(wake_at for wake_at, _ in due)
+            for sleeper in [s for s in due if s[0] == self.now]:
+                self._sleepers.remove(sleeper)
+                sleeper[1].set_result(None)
+            await _settle()
+        self.now = target
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
 class TestScheduler:
     @pytest.mark.asyncio
-    async def test_register_and_start(self):
-        scheduler = Scheduler()
+    async def test_register_and_start(self, clock):
+        scheduler = Scheduler(sleep=clock.sleep)
         calls = []
 
         async def task():
             calls.append(1)
 
-        scheduler.register("test", task, interval_seconds=0.1)
+        scheduler.register("test", task, interval_seconds=1)
         await scheduler.start()
         assert scheduler.is_running
 
-        await asyncio.sleep(0.3)
+        # Runs immediately, then once per elapsed interval
+        await clock.advance(3)
         await scheduler.stop()
         assert not scheduler.is_running
-        assert len(calls) >= 1
+        assert len(calls) == 4
 
     @pytest.mark.asyncio
-    async def test_disabled_task(self):
-        scheduler = Scheduler()
+    async def test_independent_intervals(self, clock):
+        scheduler = Scheduler(sleep=clock.sleep)
+        calls: dict[str, int] = {"fast": 0, "slow": 0}
+
+        def make(name):
+            async def task():
+                calls[name] += 1
+            return task
+
+        scheduler.register("fast", make("fast"), interval_seconds=1)
+        scheduler.register("slow", make("slow"), interval_seconds=2)
+        await scheduler.start()
+        await clock.advance(4)
+        await scheduler.stop()
+
+        assert calls == {"fast": 5, "slow": 3}
+
+    @pytest.mark.asyncio
+    async def test_disabled_task(self, clock):
+        scheduler = Scheduler(sleep=clock.sleep)
         calls = []
 
         async def task():
             calls.append(1)
 
-        scheduler.register("test", task, interval_seconds=0.1, enabled=False)
+        scheduler.register("test", task, interval_seconds=1, enabled=False)
         await scheduler.start()
-        await asyncio.sleep(0.3)
+        await clock.advance(3)
         await scheduler.stop()
         assert len(calls) == 0
 
@@ -70,21 +125,22 @@ class TestScheduler:
         assert status[1]["enabled"] is False
 
     @pytest.mark.asyncio
-    async def test_error_in_task_doesnt_stop_scheduler(self):
-        scheduler = Scheduler()
+    async def test_error_in_task_doesnt_stop_scheduler(self, clock):
+        scheduler = Scheduler(sleep=clock.sleep)
         calls = []
 
         async def failing_task():
             calls.append(1)
             raise ValueError("boom")
 
-        scheduler.register("fail", failing_task, interval_seconds=0.1)
+        scheduler.register("fail", failing_task, interval_seconds=1)
         await scheduler.start()
-        await asyncio.sleep(0.4)
+        await clock.advance(3)
         await scheduler.stop()
 
-        # Should have run multiple times despite errors
-        assert len(calls) >= 2
+        # Should have run on every interval despite errors
+        assert len(calls) == 4
+        assert scheduler.get_status()[0]["error_count"] == 4
 
     @pytest.mark.asyncio
     async def test_no_double_start(self):
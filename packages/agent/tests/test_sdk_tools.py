@@ -62,3 +62,20 @@ class TestSDKEventsTool:
             query = call_args[0][0]
             assert "service = ?" in query
             assert "event_type = ?" in query
+            assert query.count("?") == len(call_args[0][1])
+
+    @pytest.mark.asyncio
+    async def test_query_reused_per_filter_shape(self):
+        mock_repo = MagicMock()
+        mock_repo.execute_raw.return_value = []
+        with patch(
+            "argus_agent.storage.repositories.get_metrics_repository", return_value=mock_repo
+        ):
+            await self.tool.execute(service="a", until="2024-01-01T00:00:00+00:00")
+            await self.tool.execute(service="b", until="2024-01-02T00:00:00+00:00")
+
+        (q1, p1), (q2, p2) = (c[0] for c in mock_repo.execute_raw.call_args_list)
+        assert q1 is q2
+        assert "timestamp <= ?" in q1
+        assert q1.count("?") == len(p1) == len(p2)
+        assert p2[2] == "b"
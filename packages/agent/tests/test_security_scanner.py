@@ -3,23 +3,22 @@
 from __future__ import annotations
 
 from collections import namedtuple
+from contextlib import nullcontext
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from argus_agent.config import reset_settings
 from argus_agent.events.bus import EventBus, reset_event_bus
 from argus_agent.events.types import EventType
 
 
 @pytest.fixture(autouse=True)
-def _reset():
-    reset_settings()
+def _reset(fresh_settings):
     reset_event_bus()
     yield
     reset_event_bus()
-    reset_settings()
 
 
 # Namedtuples to mimic psutil objects
@@ -27,6 +26,17 @@ Addr = namedtuple("Addr", ["ip", "port"])
 Connection = namedtuple("Connection", ["status", "laddr", "raddr", "pid"])
 ProcInfo = namedtuple("ProcInfo", ["pid", "name", "exe", "cmdline", "ppid"])
 
+# Connections shared by the port and outbound tests (namedtuples are immutable)
+_SSH_LISTEN = Connection(status="LISTEN", laddr=Addr("0.0.0.0", 22), raddr=None, pid=100)
+_HTTP_LISTEN = Connection(status="LISTEN", laddr=Addr("0.0.0.0", 80), raddr=None, pid=200)
+_BACKDOOR_LISTEN = Connection(status="LISTEN", laddr=Addr("0.0.0.0", 4444), raddr=None, pid=999)
+_DNS_HTTPS_OUT = Connection(
+    status="ESTABLISHED", laddr=Addr("10.0.0.1", 12345), raddr=Addr("8.8.8.8", 443), pid=100,
+)
+_IRC_OUT = Connection(
+    status="ESTABLISHED", laddr=Addr("10.0.0.1", 54321), raddr=Addr("1.2.3.4", 6667), pid=999,
+)
+
 
 def _make_proc(pid, name, exe="", cmdline=None, ppid=1):
     """Create a mock process for psutil.process_iter."""
@@ -35,28 +45,46 @@ def _make_proc(pid, name, exe="", cmdline=None, ppid=1):
     return mock
 
 
-def _make_scanner():
-    """Create a SecurityScanner with mocked settings."""
-    with patch("argus_agent.collectors.security_scanner.get_settings") as mock_settings:
-        settings = MagicMock()
-        settings.collector.host_root = ""
-        mock_settings.return_value = settings
-        from argus_agent.collectors.security_scanner import SecurityScanner
+@pytest.fixture(scope="module")
+def _shared_scanner():
+    """One SecurityScanner, built with mocked settings, for the whole module."""
+    from argus_agent.collectors.security_scanner import SecurityScanner
+
+    settings = MagicMock()
+    settings.collector.host_root = ""
+    with patch("argus_agent.collectors.security_scanner.get_settings", return_value=settings):
         return SecurityScanner(interval=300)
 
 
+@pytest.fixture()
+def scanner(_shared_scanner):
+    """The shared scanner with its baselines cleared, as on a fresh instance."""
+    _shared_scanner._known_ports.clear()
+    _shared_scanner._known_outbound = frozenset()
+    _shared_scanner._known_executables = frozenset()
+    _shared_scanner._last_results = {}
+    return _shared_scanner
+
+
+@pytest.fixture()
+def fake_fs(monkeypatch):
+    """Return a setter for what ``Path.exists``/``stat``/``read_text`` report for any path."""
+
+    def _apply(exists: bool = True, mode: int = 0o100600, read_text: str = "") -> None:
+        monkeypatch.setattr(Path, "exists", lambda self, *a, **kw: exists)
+        monkeypatch.setattr(Path, "stat", lambda self, *a, **kw: SimpleNamespace(st_mode=mode))
+        monkeypatch.setattr(Path, "read_text", lambda self, *a, **kw: read_text)
+
+    return _apply
+
+
 # ---- Open ports ----
 
 
 @pytest.mark.asyncio
-async def test_open_ports_baseline():
+async def test_open_ports_baseline(scanner):
     """First scan records baseline, no events emitted."""
-    scanner = _make_scanner()
-    conns = [
-        Connection(status="LISTEN", laddr=Addr("0.0.0.0", 22), raddr=None, pid=100),
-        Connection(status="LISTEN", laddr=Addr("0.0.0.0", 80), raddr=None, pid=200),
-    ]
-    with patch("psutil.net_connections", return_value=conns):
+    with patch("psutil.net_connections", return_value=[_SSH_LISTEN, _HTTP_LISTEN]):
         result = scanner._check_open_ports()
 
     assert 22 in result["listening_ports"]
@@ -65,21 +93,14 @@ async def test_open_ports_baseline():
 
 
 @pytest.mark.asyncio
-async def test_open_ports_new_port_detected():
+async def test_open_ports_new_port_detected(scanner):
     """New port after baseline triggers NEW_OPEN_PORT event."""
-    scanner = _make_scanner()
-
     # First scan: baseline
-    conns1 = [Connection(status="LISTEN", laddr=Addr("0.0.0.0", 22), raddr=None, pid=100)]
-    with patch("psutil.net_connections", return_value=conns1):
+    with patch("psutil.net_connections", return_value=[_SSH_LISTEN]):
         scanner._check_open_ports()
 
     # Second scan: new port
-    conns2 = [
-        Connection(status="LISTEN", laddr=Addr("0.0.0.0", 22), raddr=None, pid=100),
-        Connection(status="LISTEN", laddr=Addr("0.0.0.0", 4444), raddr=None, pid=999),
-    ]
-    with patch("psutil.net_connections", return_value=conns2):
+    with patch("psutil.net_connections", return_value=[_SSH_LISTEN, _BACKDOOR_LISTEN]):
         result = scanner._check_open_ports()
 
     assert len(result["events"]) == 1
@@ -87,25 +108,33 @@ async def test_open_ports_new_port_detected():
     assert result["events"][0]["data"]["port"] == 4444
 
 
+@pytest.mark.asyncio
+async def test_open_ports_dual_stack_reported_once(scanner):
+    """A new port listening on both IPv4 and IPv6 yields a single event."""
+    with patch("psutil.net_connections", return_value=[_SSH_LISTEN]):
+        scanner._check_open_ports()
+
+    v6 = _BACKDOOR_LISTEN._replace(laddr=Addr("::", 4444))
+    with patch("psutil.net_connections", return_value=[_SSH_LISTEN, _BACKDOOR_LISTEN, v6]):
+        result = scanner._check_open_ports()
+
+    assert result["listening_ports"] == [22, 4444]
+    assert len(result["events"]) == 1
+
+
 # ---- Failed SSH ----
 
+# 15 failed logins from one IP: above the brute-force threshold of 10
+_AUTH_LOG_15 = "\n".join(
+    f"Jan 1 12:00:{i:02d} server sshd: Failed password for root from 10.0.0.1 port 22 ssh2"
+    for i in range(15)
+)
 
-@pytest.mark.asyncio
-async def test_failed_ssh_brute_force(tmp_path):
-    scanner = _make_scanner()
-    auth_log = tmp_path / "auth.log"
-
-    lines = []
-    for i in range(15):
-        lines.append(
-            f"Jan 1 12:00:{i:02d} server sshd: "
-            f"Failed password for root from 10.0.0.1 port 22 ssh2"
-        )
-    auth_log.write_text("\n".join(lines))
 
-    with patch.object(Path, "exists", return_value=True), \
-         patch.object(Path, "read_text", return_value=auth_log.read_text()):
-        result = scanner._check_failed_ssh()
+@pytest.mark.asyncio
+async def test_failed_ssh_brute_force(scanner, fake_fs):
+    fake_fs(read_text=_AUTH_LOG_15)
+    result = scanner._check_failed_ssh()
 
     assert result["failures_by_ip"]["10.0.0.1"] == 15
     assert len(result["events"]) == 1
@@ -113,10 +142,22 @@ async def test_failed_ssh_brute_force(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_failed_ssh_no_log():
-    scanner = _make_scanner()
-    with patch.object(Path, "exists", return_value=False):
-        result = scanner._check_failed_ssh()
+async def test_failed_ssh_only_scans_log_tail(scanner, fake_fs):
+    """Failures older than the last 1000 lines are not counted."""
+    old = ["sshd: Failed password for root from 10.0.0.9 port 22 ssh2"] * 20
+    recent = ["sshd: Failed password for admin from 10.0.0.2 port 22 ssh2"] * 1000
+    text = "\n".join(old + recent) + "\n"
+
+    fake_fs(read_text=text)
+    result = scanner._check_failed_ssh()
+
+    assert result["failures_by_ip"] == {"10.0.0.2": 1000}
+
+
+@pytest.mark.asyncio
+async def test_failed_ssh_no_log(scanner, fake_fs):
+    fake_fs(exists=False)
+    result = scanner._check_failed_ssh()
     assert result["failures_by_ip"] == {}
     assert len(result["events"]) == 0
 
@@ -125,16 +166,10 @@ async def test_failed_ssh_no_log():
 
 
 @pytest.mark.asyncio
-async def test_file_permissions_world_readable():
-    scanner = _make_scanner()
-
-    mock_stat = MagicMock()
+async def test_file_permissions_world_readable(scanner, fake_fs):
     # 0o100644 = rw-r--r-- = mode "644" -> others=4 (world-readable)
-    mock_stat.st_mode = 0o100644
-
-    with patch.object(Path, "exists", return_value=True), \
-         patch.object(Path, "stat", return_value=mock_stat):
-        result = scanner._check_file_permissions()
+    fake_fs(mode=0o100644)
+    result = scanner._check_file_permissions()
 
     # shadow is world-readable with mode 644 -> event
     shadow_events = [e for e in result["events"] if e["data"]["path"] == "/etc/shadow"]
@@ -143,15 +178,9 @@ async def test_file_permissions_world_readable():
 
 
 @pytest.mark.asyncio
-async def test_file_permissions_secure():
-    scanner = _make_scanner()
-
-    mock_stat = MagicMock()
-    mock_stat.st_mode = 0o100600  # rw------- = mode "600" -> secure
-
-    with patch.object(Path, "exists", return_value=True), \
-         patch.object(Path, "stat", return_value=mock_stat):
-        result = scanner._check_file_permissions()
+async def test_file_permissions_secure(scanner, fake_fs):
+    fake_fs(mode=0o100600)  # rw------- = mode "600" -> secure
+    result = scanner._check_file_permissions()
 
     assert len(result["events"]) == 0
 
@@ -160,8 +189,7 @@ async def test_file_permissions_secure():
 
 
 @pytest.mark.asyncio
-async def test_suspicious_process_known_bad():
-    scanner = _make_scanner()
+async def test_suspicious_process_known_bad(scanner):
     procs = [_make_proc(999, "xmrig", "/tmp/xmrig")]
 
     with patch("psutil.process_iter", return_value=procs):
@@ -172,8 +200,7 @@ async def test_suspicious_process_known_bad():
 
 
 @pytest.mark.asyncio
-async def test_suspicious_process_deleted_binary():
-    scanner = _make_scanner()
+async def test_suspicious_process_deleted_binary(scanner):
     procs = [_make_proc(888, "malware", "/usr/bin/malware (deleted)")]
 
     with patch("psutil.process_iter", return_value=procs):
@@ -184,8 +211,7 @@ async def test_suspicious_process_deleted_binary():
 
 
 @pytest.mark.asyncio
-async def test_no_suspicious_processes():
-    scanner = _make_scanner()
+async def test_no_suspicious_processes(scanner):
     procs = [_make_proc(1, "systemd", "/sbin/init")]
 
     with patch("psutil.process_iter", return_value=procs):
@@ -199,9 +225,7 @@ async def test_no_suspicious_processes():
 
 
 @pytest.mark.asyncio
-async def test_new_executable_detected(tmp_path):
-    scanner = _make_scanner()
-
+async def test_new_executable_detected(scanner, tmp_path):
     # First scan: baseline with no executables
     with patch.object(Path, "exists", return_value=False):
         scanner._check_new_executables()
@@ -212,10 +236,10 @@ async def test_new_executable_detected(tmp_path):
     entry1.path = "/tmp/evil"
     entry1.stat.return_value = MagicMock(st_mode=0o100755)
 
-    scanner._known_executables = set()  # Reset so first scan records baseline
+    scanner._known_executables = frozenset()  # Reset so first scan records baseline
 
     with patch.object(Path, "exists", return_value=True), \
-         patch("os.scandir", return_value=[entry1]):
+         patch("os.scandir", return_value=nullcontext([entry1])):
         scanner._check_new_executables()  # baseline
 
     entry2 = MagicMock()
@@ -224,7 +248,7 @@ async def test_new_executable_detected(tmp_path):
     entry2.stat.return_value = MagicMock(st_mode=0o100755)
 
     with patch.object(Path, "exists", return_value=True), \
-         patch("os.scandir", return_value=[entry1, entry2]):
+         patch("os.scandir", return_value=nullcontext([entry1, entry2])):
         result = scanner._check_new_executables()
 
     assert len(result["events"]) == 1
@@ -235,31 +259,13 @@ async def test_new_executable_detected(tmp_path):
 
 
 @pytest.mark.asyncio
-async def test_outbound_connection_new():
-    scanner = _make_scanner()
-
+async def test_outbound_connection_new(scanner):
     # Baseline
-    conns1 = [
-        Connection(
-            status="ESTABLISHED", laddr=Addr("10.0.0.1", 12345),
-            raddr=Addr("8.8.8.8", 443), pid=100,
-        ),
-    ]
-    with patch("psutil.net_connections", return_value=conns1):
+    with patch("psutil.net_connections", return_value=[_DNS_HTTPS_OUT]):
         scanner._check_outbound_connections()
 
     # New connection
-    conns2 = [
-        Connection(
-            status="ESTABLISHED", laddr=Addr("10.0.0.1", 12345),
-            raddr=Addr("8.8.8.8", 443), pid=100,
-        ),
-        Connection(
-            status="ESTABLISHED", laddr=Addr("10.0.0.1", 54321),
-            raddr=Addr("1.2.3.4", 6667), pid=999,
-        ),
-    ]
-    with patch("psutil.net_connections", return_value=conns2):
+    with patch("psutil.net_connections", return_value=[_DNS_HTTPS_OUT, _IRC_OUT]):
         result = scanner._check_outbound_connections()
 
     assert len(result["events"]) == 1
@@ -271,8 +277,7 @@ async def test_outbound_connection_new():
 
 
 @pytest.mark.asyncio
-async def test_scan_once_publishes_events():
-    scanner = _make_scanner()
+async def test_scan_once_publishes_events(scanner):
     bus = EventBus()
 
     published: list = []
@@ -284,7 +289,7 @@ async def test_scan_once_publishes_events():
          patch("psutil.net_connections", return_value=[]), \
          patch.object(Path, "exists", return_value=False), \
          patch("psutil.process_iter", return_value=procs), \
-         patch("os.scandir", return_value=[]):
+         patch("os.scandir", return_value=nullcontext([])):
         results = await scanner.scan_once()
 
     assert "checks" in results
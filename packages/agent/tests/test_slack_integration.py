@@ -31,7 +31,7 @@ def _make_app():
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_app():
     return _make_app()
 
@@ -2,23 +2,30 @@
 
 from __future__ import annotations
 
-import json
+import logging
 import os
+import re
 import stat
 import tempfile
+from collections import Counter
 from unittest.mock import patch
 
+import orjson
 import pytest
 
 from argus_agent.scheduler.soak import (
+    ENDPOINTS,
     SoakAppConfig,
     SoakTestRunner,
     _create_executable_artifact,
     _emit_error_burst,
     _pick_endpoint,
+    _pick_endpoints,
     parse_soak_apps,
 )
 
+_ERROR_BURST_RE = re.compile("error burst", re.IGNORECASE)
+
 
 class TestParseSoakApps:
     """Tests for parse_soak_apps()."""
@@ -38,7 +45,7 @@ class TestParseSoakApps:
             },
             {"path": "examples/node-express", "cmd": "node app.js", "port": 8082},
         ]
-        with patch.dict(os.environ, {"ARGUS_SOAK_APPS": json.dumps(apps)}):
+        with patch.dict(os.environ, {"ARGUS_SOAK_APPS": orjson.dumps(apps).decode()}):
             result = parse_soak_apps()
             assert len(result) == 2
             assert isinstance(result[0], SoakAppConfig)
@@ -60,51 +67,51 @@ class TestPickEndpoint:
 
     def test_returns_valid_endpoint(self) -> None:
         valid = {"/", "/error", "/slow", "/chain", "/users", "/checkout", "/multi-error"}
-        for _ in range(100):
-            ep = _pick_endpoint()
-            assert ep in valid
+        assert _pick_endpoint() in valid
+        assert set(_pick_endpoints(200)) <= valid
 
     def test_distribution_rough(self) -> None:
-        """Normal endpoints should appear most often."""
-        counts: dict[str, int] = {}
+        """Each endpoint should appear close to its weighted share."""
         n = 10_000
-        for _ in range(n):
-            ep = _pick_endpoint()
-            counts[ep] = counts.get(ep, 0) + 1
+        counts = Counter(_pick_endpoints(n))
+        total_weight = sum(w for _, w in ENDPOINTS)
 
-        # "/" has weight 40/100 = 40%, so should be > 30% over many trials
-        assert counts.get("/", 0) > n * 0.3
-        # "/error" has weight 20/100 = 20%
-        assert counts.get("/error", 0) > n * 0.1
+        for ep, weight in ENDPOINTS:
+            expected = n * weight / total_weight
+            # Five standard deviations of the binomial count; a flake is ~1e-6
+            tolerance = 5 * (expected * (1 - weight / total_weight)) ** 0.5
+            assert abs(counts[ep] - expected) < tolerance, ep
 
 
 class TestCreateExecutableArtifact:
     """Tests for _create_executable_artifact()."""
 
-    def test_creates_executable_file(self) -> None:
-        path = _create_executable_artifact()
-        try:
-            assert os.path.exists(path)
-            assert os.stat(path).st_mode & stat.S_IEXEC
-            assert "soak_test_" in os.path.basename(path)
-        finally:
-            os.unlink(path)
+    def test_creates_executable_file(self, tmp_path) -> None:
+        path = _create_executable_artifact(str(tmp_path))
+        assert os.path.dirname(path) == str(tmp_path)
+        assert os.stat(path).st_mode & stat.S_IEXEC
+        assert "soak_test_" in os.path.basename(path)
+        with open(path) as f:
+            assert f.readline() == "#!/bin/sh\n"
 
 
 class TestEmitErrorBurst:
     """Tests for _emit_error_burst()."""
 
     def test_emits_correct_count(self, caplog: pytest.LogCaptureFixture) -> None:
-        import logging
-
         with caplog.at_level(logging.ERROR, logger="argus.soak.error_burst"):
             _emit_error_burst(count=5)
         error_msgs = [
             r for r in caplog.records
-            if r.levelno == logging.ERROR
-            and "error burst" in r.message.lower()
+            if r.levelno == logging.ERROR and _ERROR_BURST_RE.search(r.message)
         ]
         assert len(error_msgs) == 5
+        assert error_msgs[0].message.startswith("Soak test error burst [1/5]")
+
+    def test_respects_logger_level(self, caplog: pytest.LogCaptureFixture) -> None:
+        with caplog.at_level(logging.CRITICAL, logger="argus.soak.error_burst"):
+            _emit_error_burst(count=5)
+        assert not caplog.records
 
 
 class TestSoakTestRunner:
@@ -2,59 +2,133 @@
 
 from __future__ import annotations
 
-import tempfile
-from pathlib import Path
+import sqlite3
+from datetime import UTC, datetime, timedelta
 
 import pytest
-
-from argus_agent.storage.database import close_db, get_session, init_db
-from argus_agent.storage.models import Conversation
-from argus_agent.storage.timeseries import close_timeseries, get_connection, init_timeseries
-
-
-@pytest.mark.asyncio
-async def test_sqlite_init_and_tables():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = str(Path(tmpdir) / "test.db")
-        await init_db(db_path)
-
-        async with get_session() as session:
-            # Verify we can create and query records
-            conv = Conversation(id="test-1", title="Test Conversation", source="user")
-            session.add(conv)
+from sqlalchemy import inspect, text
+
+from argus_agent.storage import database as db_mod
+from argus_agent.storage import timeseries
+from argus_agent.storage.database import get_session
+from argus_agent.storage.models import Base, Conversation
+from argus_agent.storage.timeseries import (
+    close_timeseries,
+    get_connection,
+    init_timeseries,
+    insert_metrics_batch,
+)
+from tests.conftest import batch_metric_rows, timeseries_db_path
+
+
+async def test_sqlite_init_and_tables(tmp_path, monkeypatch):
+    """init_db() on a real file: pragmas, column migration and create_all."""
+    # Hand the shared test engine back once this test has closed its own
+    monkeypatch.setattr(db_mod, "_engine", None)
+    monkeypatch.setattr(db_mod, "_session_factory", None)
+    db_path = tmp_path / "test.db"
+
+    # A table from an older schema, missing columns the ORM now declares
+    with sqlite3.connect(db_path) as legacy:
+        legacy.execute("CREATE TABLE conversations (id VARCHAR(36) PRIMARY KEY)")
+
+    await db_mod.init_db(str(db_path))
+    try:
+        async with db_mod.get_session() as session:
+            conn = await session.connection()
+            tables = await conn.run_sync(lambda c: set(inspect(c).get_table_names()))
+            columns = await conn.run_sync(
+                lambda c: {col["name"] for col in inspect(c).get_columns("conversations")}
+            )
+            journal_mode = (await session.execute(text("PRAGMA journal_mode"))).scalar()
+            foreign_keys = (await session.execute(text("PRAGMA foreign_keys"))).scalar()
+
+            session.add(Conversation(id="test-1", title="Test Conversation"))
             await session.commit()
-
-        await close_db()
-
-
-def test_duckdb_init_and_tables():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = str(Path(tmpdir) / "test.duckdb")
-        init_timeseries(db_path)
-
-        conn = get_connection()
-        # Verify tables exist
-        tables = conn.execute("SHOW TABLES").fetchall()
-        table_names = [t[0] for t in tables]
-        assert "system_metrics" in table_names
-        assert "log_index" in table_names
-        assert "sdk_events" in table_names
-
-        close_timeseries()
-
-
-def test_duckdb_insert_and_query():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        db_path = str(Path(tmpdir) / "test.duckdb")
-        init_timeseries(db_path)
-
-        conn = get_connection()
-        conn.execute("""
-            INSERT INTO system_metrics (timestamp, metric_name, value, labels)
-            VALUES (NOW(), 'cpu_percent', 45.2, '{"core": "all"}')
-        """)
-
-        result = conn.execute("SELECT COUNT(*) FROM system_metrics").fetchone()
-        assert result[0] == 1
-
+            stored = await session.get(Conversation, "test-1")
+    finally:
+        await db_mod.close_db()
+
+    assert set(Base.metadata.tables) <= tables
+    assert {"tenant_id", "title", "source", "created_at", "updated_at"} <= columns
+    assert journal_mode == "wal"
+    assert foreign_keys == 1
+    assert stored.source == "user"
+
+
+@pytest.mark.usefixtures("_init_db")
+async def test_shared_engine_round_trip():
+    async with get_session() as session:
+        # Verify we can create and query records
+        conv = Conversation(id="test-1", title="Test Conversation", source="user")
+        session.add(conv)
+        await session.commit()
+
+    async with get_session() as session:
+        stored = await session.get(Conversation, "test-1")
+        assert stored is not None
+        assert stored.title == "Test Conversation"
+
+
+@pytest.fixture(scope="module")
+def duckdb_conn(tmp_path_factory):
+    """One initialized DuckDB store shared by this module's tests."""
+    # Module rather than session scope: other modules re-init the global
+    # time-series connection, which would close a session-wide one.
+    init_timeseries(timeseries_db_path(tmp_path_factory.mktemp("ts")))
+    yield get_connection()
+    close_timeseries()
+
+
+@pytest.fixture()
+def _clean_metrics(duckdb_conn):
+    """Start each test with an empty ``system_metrics`` table."""
+    duckdb_conn.execute("DELETE FROM system_metrics")
+
+
+def test_duckdb_init_and_tables(duckdb_conn):
+    tables = duckdb_conn.execute("SHOW TABLES").fetchall()
+    table_names = [t[0] for t in tables]
+    assert "system_metrics" in table_names
+    assert "log_index" in table_names
+    assert "sdk_events" in table_names
+
+
+@pytest.mark.usefixtures("_clean_metrics")
+def test_duckdb_insert_and_query(duckdb_conn):
+    # Naive, so the stored timestamps do not depend on the session time zone
+    now = datetime.now(UTC).replace(tzinfo=None)
+    insert_metrics_batch([
+        (ts, name, value, {"core": "all"})
+        for ts, name, value, _ in batch_metric_rows(
+            "cpu_percent", map(float, range(10_000)), now, timedelta(seconds=-1)
+        )
+    ])
+
+    result = duckdb_conn.execute(
+        "SELECT COUNT(*), MAX(value), MIN(timestamp), ANY_VALUE(labels) FROM system_metrics"
+    ).fetchone()
+    assert result[:2] == (10_000, 9_999.0)
+    assert result[2] == now - timedelta(seconds=9_999)
+    assert result[3] == '{"core": "all"}'
+
+
+
+def test_duckdb_file_store_persists(tmp_path, monkeypatch):
+    """The file-backed store keeps its rows across a close and reopen.
+
+    Runs regardless of ``ARGUS_TS_TEST_MEM``; monkeypatch hands the global
+    connection back to the module fixture afterwards.
+    """
+    monkeypatch.setattr(timeseries, "_conn", None)
+    db_path = str(tmp_path / "persist.duckdb")
+
+    init_timeseries(db_path)
+    timeseries.insert_metric("cpu_percent", 42.0)
+    close_timeseries()
+
+    init_timeseries(db_path)
+    try:
+        assert [r["value"] for r in timeseries.query_metrics("cpu_percent")] == [42.0]
+    finally:
         close_timeseries()
@@ -5,18 +5,10 @@ from __future__ import annotations
 import asyncio
 
 import pytest
-from fakeredis import aioredis as fakeredis_aioredis
 
 from argus_agent.queue.task_queue import TaskPayload, TaskQueue, TaskStatus
 
 
-@pytest.fixture
-async def redis():
-    r = fakeredis_aioredis.FakeRedis(decode_responses=True)
-    yield r
-    await r.aclose()
-
-
 @pytest.fixture
 def queue(redis):
     return TaskQueue(redis)
@@ -40,9 +32,8 @@ class TestTaskQueue:
         p2 = TaskPayload(tenant_id="t1", content="second")
         p3 = TaskPayload(tenant_id="t1", content="third")
 
-        await queue.enqueue(p1)
-        await queue.enqueue(p2)
-        await queue.enqueue(p3)
+        task_ids = await queue.enqueue_many([p1, p2, p3])
+        assert task_ids == [p1.task_id, p2.task_id, p3.task_id]
 
         r1 = await queue.dequeue(timeout=1)
         r2 = await queue.dequeue(timeout=1)
@@ -52,6 +43,20 @@ class TestTaskQueue:
         assert r2 is not None and r2.content == "second"
         assert r3 is not None and r3.content == "third"
 
+    @pytest.mark.asyncio
+    async def test_enqueue_many_sets_pending_status(self, queue):
+        payloads = [TaskPayload(tenant_id=f"t{i}", content="x") for i in range(2)]
+        await queue.enqueue_many(payloads)
+
+        statuses = await asyncio.gather(*(queue.get_status(p.task_id) for p in payloads))
+        assert statuses == [
+            {"status": TaskStatus.PENDING, "tenant_id": p.tenant_id} for p in payloads
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_many_empty(self, queue):
+        assert await queue.enqueue_many([]) == []
+
     @pytest.mark.asyncio
     async def test_status_tracking(self, queue):
         payload = TaskPayload(tenant_id="t1", content="test")
@@ -84,10 +89,12 @@ class TestTaskQueue:
 
         # Use a listener task to capture the published message
         received = []
+        subscribed = asyncio.Event()
 
         async def _listen():
             pubsub = redis.pubsub()
             await pubsub.subscribe(f"argus:cancel:{task_id}")
+            subscribed.set()
             async for msg in pubsub.listen():
                 if msg["type"] == "message":
                     received.append(msg["data"])
@@ -96,7 +103,7 @@ class TestTaskQueue:
             await pubsub.aclose()
 
         listener = asyncio.create_task(_listen())
-        await asyncio.sleep(0.05)  # let subscription establish
+        await asyncio.wait_for(subscribed.wait(), timeout=2)
 
         await queue.cancel(task_id)
         await asyncio.wait_for(listener, timeout=2)
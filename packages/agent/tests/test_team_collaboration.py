@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import importlib
+from collections import deque
+from functools import cache
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 from argus_agent.auth.dependencies import get_current_user
@@ -39,17 +44,66 @@ def _make_app():
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_app():
     return _make_app()
 
 
-def _mock_session_ctx(mock_session):
-    """Return a mock that works as an async context manager."""
-    ctx = MagicMock()
-    ctx.__aenter__ = AsyncMock(return_value=mock_session)
-    ctx.__aexit__ = AsyncMock(return_value=False)
-    return ctx
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def client(mock_app):
+    """One HTTP client over the app, shared by every API test in the module."""
+    async with AsyncClient(transport=ASGITransport(app=mock_app), base_url="http://test") as c:
+        yield c
+
+
+class FakeResult:
+    """Stands in for a SQLAlchemy ``Result`` with precomputed values."""
+
+    def __init__(self, value=None, rows=()):
+        self._value = value
+        self._rows = list(rows)
+
+    def scalar(self):
+        return self._value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Async session stub that returns *results* from ``execute`` in call order."""
+
+    def __init__(self, *results: FakeResult):
+        self._results = deque(results)
+        self.added: list = []
+        self.deleted: list = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, *args, **kwargs):
+        if not self._results:
+            raise AssertionError(f"unexpected query: {statement}")
+        return self._results.popleft()
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+    async def commit(self):
+        self.commits += 1
 
 
 # ---------------------------------------------------------------------------
@@ -58,71 +112,44 @@ def _mock_session_ctx(mock_session):
 
 
 class TestServiceConfigAPI:
-    @pytest.mark.asyncio
-    async def test_list_configs_empty(self, mock_app):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.get("/api/v1/service-configs")
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_list_configs_empty(self, client):
+        session = FakeSession(FakeResult(rows=[]))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.get("/api/v1/service-configs")
             assert res.status_code == 200
             assert res.json()["configs"] == []
 
-    @pytest.mark.asyncio
-    async def test_upsert_config(self, mock_app):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        mock_session.add = MagicMock()
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.put(
-                    "/api/v1/service-configs/my-service",
-                    json={
-                        "service_name": "my-service",
-                        "environment": "staging",
-                        "owner_user_id": "user-1",
-                        "description": "Test service",
-                    },
-                )
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_upsert_config(self, client):
+        session = FakeSession(FakeResult(None))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.put(
+                "/api/v1/service-configs/my-service",
+                json={
+                    "service_name": "my-service",
+                    "environment": "staging",
+                    "owner_user_id": "user-1",
+                    "description": "Test service",
+                },
+            )
             assert res.status_code == 200
             assert res.json()["status"] == "ok"
+            assert len(session.added) == 1
+            assert session.commits == 1
 
-    @pytest.mark.asyncio
-    async def test_delete_config(self, mock_app):
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock()
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.delete("/api/v1/service-configs/my-service")
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_delete_config(self, client):
+        config = SimpleNamespace(service_name="my-service")
+        session = FakeSession(FakeResult(config))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.delete("/api/v1/service-configs/my-service")
             assert res.status_code == 200
             assert res.json()["status"] == "ok"
+            assert session.deleted == [config]
 
 
 # ---------------------------------------------------------------------------
@@ -131,124 +158,71 @@ class TestServiceConfigAPI:
 
 
 class TestEscalationPolicyAPI:
-    @pytest.mark.asyncio
-    async def test_list_policies_empty(self, mock_app):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.get("/api/v1/escalation-policies")
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_list_policies_empty(self, client):
+        session = FakeSession(FakeResult(rows=[]))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.get("/api/v1/escalation-policies")
             assert res.status_code == 200
             assert res.json()["policies"] == []
 
-    @pytest.mark.asyncio
-    async def test_create_policy(self, mock_app):
-        mock_session = AsyncMock()
-        mock_session.add = MagicMock()
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.post(
-                    "/api/v1/escalation-policies",
-                    json={
-                        "name": "Critical Alerts",
-                        "service_name": "api-gateway",
-                        "min_severity": "CRITICAL",
-                        "primary_contact_id": "user-1",
-                        "backup_contact_id": "user-2",
-                    },
-                )
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_create_policy(self, client):
+        session = FakeSession()
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.post(
+                "/api/v1/escalation-policies",
+                json={
+                    "name": "Critical Alerts",
+                    "service_name": "api-gateway",
+                    "min_severity": "CRITICAL",
+                    "primary_contact_id": "user-1",
+                    "backup_contact_id": "user-2",
+                },
+            )
             assert res.status_code == 200
             assert res.json()["status"] == "ok"
             assert "id" in res.json()
-
-    @pytest.mark.asyncio
-    async def test_update_policy(self, mock_app):
-        mock_policy = MagicMock()
-        mock_policy.id = "pol-1"
-        mock_policy.tenant_id = "tenant-1"
-
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_policy
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.put(
-                    "/api/v1/escalation-policies/pol-1",
-                    json={"name": "Updated Policy", "min_severity": "URGENT"},
-                )
+            assert len(session.added) == 1
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_update_policy(self, client):
+        policy = SimpleNamespace(id="pol-1", tenant_id="tenant-1")
+        session = FakeSession(FakeResult(policy))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.put(
+                "/api/v1/escalation-policies/pol-1",
+                json={"name": "Updated Policy", "min_severity": "URGENT"},
+            )
             assert res.status_code == 200
-            assert mock_policy.name == "Updated Policy"
-            assert mock_policy.min_severity == "URGENT"
-
-    @pytest.mark.asyncio
-    async def test_update_policy_not_found(self, mock_app):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.put(
-                    "/api/v1/escalation-policies/nonexistent",
-                    json={"name": "X"},
-                )
+            assert policy.name == "Updated Policy"
+            assert policy.min_severity == "URGENT"
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_update_policy_not_found(self, client):
+        session = FakeSession(FakeResult(None))
+
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.put(
+                "/api/v1/escalation-policies/nonexistent",
+                json={"name": "X"},
+            )
             assert res.status_code == 404
+            assert session.commits == 0
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_delete_policy(self, client):
+        policy = SimpleNamespace(is_active=True)
+        session = FakeSession(FakeResult(policy))
 
-    @pytest.mark.asyncio
-    async def test_delete_policy(self, mock_app):
-        mock_policy = MagicMock()
-        mock_policy.is_active = True
-
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_policy
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.service_config.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.delete("/api/v1/escalation-policies/pol-1")
+        with patch("argus_agent.api.service_config.get_session", return_value=session):
+            res = await client.delete("/api/v1/escalation-policies/pol-1")
             assert res.status_code == 200
             assert res.json()["status"] == "ok"
+            assert policy.is_active is False
 
 
 # ---------------------------------------------------------------------------
@@ -257,98 +231,52 @@ class TestEscalationPolicyAPI:
 
 
 class TestInvestigationsAPI:
-    @pytest.mark.asyncio
-    async def test_list_investigations_empty(self, mock_app):
-        mock_session = AsyncMock()
-        count_result = MagicMock()
-        count_result.scalar.return_value = 0
-        data_result = MagicMock()
-        data_result.scalars.return_value.all.return_value = []
-        mock_session.execute = AsyncMock(side_effect=[count_result, data_result])
-
-        with patch(
-            "argus_agent.api.investigations.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.get("/api/v1/investigations")
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_list_investigations_empty(self, client):
+        session = FakeSession(FakeResult(0), FakeResult(rows=[]))
+
+        with patch("argus_agent.api.investigations.get_session", return_value=session):
+            res = await client.get("/api/v1/investigations")
             assert res.status_code == 200
             data = res.json()
             assert data["investigations"] == []
             assert data["total"] == 0
             assert data["page"] == 1
 
-    @pytest.mark.asyncio
-    async def test_assign_investigation(self, mock_app):
-        mock_inv = MagicMock()
-        mock_inv.id = "inv-1"
-        mock_inv.tenant_id = "tenant-1"
-        mock_inv.assigned_to = ""
-        mock_inv.assigned_by = ""
-
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_inv
-        mock_session.execute = AsyncMock(return_value=mock_result)
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.investigations.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.post(
-                    "/api/v1/investigations/inv-1/assign",
-                    json={"assigned_to": "user-2"},
-                )
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_assign_investigation(self, client):
+        inv = SimpleNamespace(id="inv-1", tenant_id="tenant-1", assigned_to="", assigned_by="")
+        session = FakeSession(FakeResult(inv))
+
+        with patch("argus_agent.api.investigations.get_session", return_value=session):
+            res = await client.post(
+                "/api/v1/investigations/inv-1/assign",
+                json={"assigned_to": "user-2"},
+            )
             assert res.status_code == 200
-            assert mock_inv.assigned_to == "user-2"
-            assert mock_inv.assigned_by == "user-1"
-
-    @pytest.mark.asyncio
-    async def test_assign_investigation_not_found(self, mock_app):
-        mock_session = AsyncMock()
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch(
-            "argus_agent.api.investigations.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.post(
-                    "/api/v1/investigations/nonexistent/assign",
-                    json={"assigned_to": "user-2"},
-                )
+            assert inv.assigned_to == "user-2"
+            assert inv.assigned_by == "user-1"
+
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_assign_investigation_not_found(self, client):
+        session = FakeSession(FakeResult(None))
+
+        with patch("argus_agent.api.investigations.get_session", return_value=session):
+            res = await client.post(
+                "/api/v1/investigations/nonexistent/assign",
+                json={"assigned_to": "user-2"},
+            )
             assert res.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_unassign_investigation(self, mock_app):
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock()
-        mock_session.commit = AsyncMock()
-
-        with patch(
-            "argus_agent.api.investigations.get_session",
-            return_value=_mock_session_ctx(mock_session),
-        ):
-            transport = ASGITransport(app=mock_app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                res = await client.post("/api/v1/investigations/inv-1/unassign")
+    @pytest.mark.asyncio(loop_scope="module")
+    async def test_unassign_investigation(self, client):
+        session = FakeSession(FakeResult())  # the UPDATE
+
+        with patch("argus_agent.api.investigations.get_session", return_value=session):
+            res = await client.post("/api/v1/investigations/inv-1/unassign")
             assert res.status_code == 200
             assert res.json()["status"] == "ok"
+            assert session.commits == 1
 
 
 # ---------------------------------------------------------------------------
@@ -391,25 +319,26 @@ class TestModels:
 # ---------------------------------------------------------------------------
 
 
+@cache
+def _route_paths(module: str, router_name: str = "router") -> frozenset[str]:
+    """Paths registered on a router, enumerated once per router."""
+    router = getattr(importlib.import_module(module), router_name)
+    return frozenset(r.path for r in router.routes)
+
+
 class TestRouterRegistration:
     def test_service_config_routes(self):
-        from argus_agent.api.service_config import router
-
-        paths = [r.path for r in router.routes]
-        assert "/service-configs" in paths
-        assert "/service-configs/{service_name}" in paths
+        paths = _route_paths("argus_agent.api.service_config")
+        assert {"/service-configs", "/service-configs/{service_name}"} <= paths
 
     def test_escalation_routes(self):
-        from argus_agent.api.service_config import escalation_router
-
-        paths = [r.path for r in escalation_router.routes]
-        assert "/escalation-policies" in paths
-        assert "/escalation-policies/{policy_id}" in paths
+        paths = _route_paths("argus_agent.api.service_config", "escalation_router")
+        assert {"/escalation-policies", "/escalation-policies/{policy_id}"} <= paths
 
     def test_investigations_routes(self):
-        from argus_agent.api.investigations import router
-
-        paths = [r.path for r in router.routes]
-        assert "/investigations" in paths
-        assert "/investigations/{investigation_id}/assign" in paths
-        assert "/investigations/{investigation_id}/unassign" in paths
+        paths = _route_paths("argus_agent.api.investigations")
+        assert {
+            "/investigations",
+            "/investigations/{investigation_id}/assign",
+            "/investigations/{investigation_id}/unassign",
+        } <= paths
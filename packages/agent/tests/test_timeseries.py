@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import tempfile
-from datetime import UTC, datetime, timedelta
-from pathlib import Path
+import math
+from datetime import UTC, datetime, timedelta, timezone
 
+import duckdb
 import pytest
 
 from argus_agent.storage.timeseries import (
     close_timeseries,
+    get_connection,
     init_timeseries,
     insert_log_entry,
     insert_metric,
@@ -19,16 +20,22 @@ from argus_agent.storage.timeseries import (
     query_metrics,
     query_metrics_summary,
 )
+from tests.conftest import batch_metric_rows, timeseries_db_path
+
+
+@pytest.fixture(scope="module")
+def _ts_conn(tmp_path_factory):
+    """One DuckDB store for the module (other modules re-init the global one)."""
+    init_timeseries(timeseries_db_path(tmp_path_factory.mktemp("ts")))
+    yield get_connection()
+    close_timeseries()
 
 
 @pytest.fixture(autouse=True)
-def _ts_db():
-    """Create a temp DuckDB for each test."""
-    with tempfile.TemporaryDirectory() as d:
-        db_path = str(Path(d) / "test_ts.duckdb")
-        init_timeseries(db_path)
-        yield
-        close_timeseries()
+def _ts_db(_ts_conn):
+    """Empty the tables these tests write to."""
+    for table in ("system_metrics", "log_index"):
+        _ts_conn.execute(f"DELETE FROM {table}")
 
 
 class TestInsertAndQueryMetrics:
@@ -61,19 +68,73 @@ class TestInsertAndQueryMetrics:
         results = query_metrics("cpu_percent")
         assert len(results) == 0
 
+    @pytest.mark.parametrize(
+        "ts",
+        [
+            datetime(2024, 3, 10, 2, 30),  # naive, inside a US DST gap
+            datetime(2024, 3, 10, 2, 30, 0, 123456),
+            datetime(2026, 1, 1, 12, tzinfo=timezone(timedelta(hours=2))),
+            datetime(2026, 1, 1, 12, tzinfo=UTC),
+        ],
+    )
+    @pytest.mark.parametrize("tz", ["UTC", "America/New_York"])
+    def test_insert_batch_matches_single_inserts(self, _ts_conn, ts, tz):
+        _ts_conn.execute(f"SET TimeZone = '{tz}'")
+        try:
+            insert_metric("disk_percent", 80.0, labels={"mount": "/"}, timestamp=ts)
+            insert_metrics_batch([(ts, "disk_percent_batch", 80.0, {"mount": "/"})])
+            rows = _ts_conn.execute(
+                "SELECT timestamp, value, labels FROM system_metrics ORDER BY metric_name"
+            ).fetchall()
+        finally:
+            _ts_conn.execute("RESET TimeZone")
+        single, batched = rows
+        assert batched == single
+        assert batched[2] == '{"mount": "/"}'
+
+    def test_insert_batch_non_str_label_keys(self, _ts_conn):
+        insert_metrics_batch([(datetime.now(UTC), "gpu_util", 1.0, {0: "gpu0"})])
+        labels, = _ts_conn.execute("SELECT labels FROM system_metrics").fetchone()
+        assert labels == '{"0": "gpu0"}'
+
+    def test_insert_batch_none_value_rejected_like_single_insert(self):
+        now = datetime.now(UTC)
+        with pytest.raises(duckdb.ConstraintException):
+            insert_metric("load_avg", None, timestamp=now)
+        with pytest.raises(duckdb.ConstraintException):
+            insert_metrics_batch([(now, "load_avg", None, None)])
+
+    def test_insert_batch_non_finite_values(self):
+        now = datetime.now(UTC)
+        insert_metrics_batch([(now, "load_avg", math.nan, None), (now, "load_avg", 1.0, None)])
+        values = [r["value"] for r in query_metrics("load_avg")]
+        assert len(values) == 2
+        assert any(math.isnan(v) for v in values)
+
+    def test_insert_large_batch(self):
+        now = datetime.now(UTC)
+        insert_metrics_batch(
+            batch_metric_rows("cpu_percent", map(float, range(100_000)), now, timedelta(seconds=-1))
+        )
+        summary = query_metrics_summary("cpu_percent", since=now - timedelta(days=2))
+        assert summary["count"] == 100_000
+
     def test_query_with_time_filter(self):
         now = datetime.now(UTC)
-        insert_metric("cpu_percent", 50.0, timestamp=now - timedelta(hours=2))
-        insert_metric("cpu_percent", 60.0, timestamp=now - timedelta(minutes=5))
-        insert_metric("cpu_percent", 70.0, timestamp=now)
+        insert_metrics_batch([
+            (now - timedelta(hours=2), "cpu_percent", 50.0, None),
+            (now - timedelta(minutes=5), "cpu_percent", 60.0, None),
+            (now, "cpu_percent", 70.0, None),
+        ])
 
         recent = query_metrics("cpu_percent", since=now - timedelta(hours=1))
         assert len(recent) == 2
 
     def test_query_with_limit(self):
         now = datetime.now(UTC)
-        for i in range(10):
-            insert_metric("cpu_percent", float(i), timestamp=now - timedelta(seconds=i))
+        insert_metrics_batch(
+            batch_metric_rows("cpu_percent", map(float, range(10)), now, timedelta(seconds=-1))
+        )
         results = query_metrics("cpu_percent", limit=5)
         assert len(results) == 5
 
@@ -85,8 +146,7 @@ class TestInsertAndQueryMetrics:
 class TestMetricsSummary:
     def test_summary_basic(self):
         now = datetime.now(UTC)
-        for v in [10.0, 20.0, 30.0, 40.0, 50.0]:
-            insert_metric("cpu_percent", v, timestamp=now)
+        insert_metrics_batch(batch_metric_rows("cpu_percent", [10.0, 20.0, 30.0, 40.0, 50.0], now))
 
         summary = query_metrics_summary("cpu_percent")
         assert summary["count"] == 5
@@ -100,8 +160,10 @@ class TestMetricsSummary:
 
     def test_summary_with_time_filter(self):
         now = datetime.now(UTC)
-        insert_metric("mem", 50.0, timestamp=now - timedelta(hours=2))
-        insert_metric("mem", 90.0, timestamp=now)
+        insert_metrics_batch([
+            (now - timedelta(hours=2), "mem", 50.0, None),
+            (now, "mem", 90.0, None),
+        ])
 
         summary = query_metrics_summary("mem", since=now - timedelta(hours=1))
         assert summary["count"] == 1
@@ -111,14 +173,28 @@ class TestMetricsSummary:
 class TestLatestMetrics:
     def test_latest(self):
         now = datetime.now(UTC)
-        insert_metric("cpu_percent", 50.0, timestamp=now - timedelta(seconds=30))
-        insert_metric("cpu_percent", 70.0, timestamp=now)
-        insert_metric("memory_percent", 80.0, timestamp=now)
+        insert_metrics_batch([
+            (now - timedelta(seconds=30), "cpu_percent", 50.0, None),
+            (now, "cpu_percent", 70.0, None),
+            (now, "memory_percent", 80.0, None),
+        ])
 
         latest = query_latest_metrics()
         assert latest["cpu_percent"] == 70.0
         assert latest["memory_percent"] == 80.0
 
+    def test_latest_across_many_metrics(self):
+        # Newest sample first for each name; insertion order must not matter
+        now = datetime.now(UTC)
+        step = timedelta(seconds=-1)
+        for i in range(10):
+            insert_metrics_batch(
+                batch_metric_rows(f"metric_{i}", map(float, range(10_000)), now, step)
+            )
+
+        latest = query_latest_metrics()
+        assert latest == {f"metric_{i}": 0.0 for i in range(10)}
+
 
 class TestLogEntries:
     def test_insert_and_query(self):
@@ -134,16 +210,18 @@ class TestLogEntries:
         assert "Connection refused" in results[0]["message_preview"]
 
     def test_filter_by_severity(self):
-        insert_log_entry("/var/log/syslog", 100, severity="ERROR")
-        insert_log_entry("/var/log/syslog", 200, severity="INFO")
-        insert_log_entry("/var/log/syslog", 300, severity="ERROR")
+        now = datetime.now(UTC)
+        insert_log_entry("/var/log/syslog", 100, severity="ERROR", timestamp=now)
+        insert_log_entry("/var/log/syslog", 200, severity="INFO", timestamp=now)
+        insert_log_entry("/var/log/syslog", 300, severity="ERROR", timestamp=now)
 
         errors = query_log_entries(severity="ERROR")
         assert len(errors) == 2
 
     def test_filter_by_file(self):
-        insert_log_entry("/var/log/syslog", 100)
-        insert_log_entry("/var/log/auth.log", 200)
+        now = datetime.now(UTC)
+        insert_log_entry("/var/log/syslog", 100, timestamp=now)
+        insert_log_entry("/var/log/auth.log", 200, timestamp=now)
 
         results = query_log_entries(file_path="/var/log/auth.log")
         assert len(results) == 1
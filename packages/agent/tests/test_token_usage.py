@@ -2,11 +2,46 @@
 
 from __future__ import annotations
 
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from argus_agent.storage.token_usage import TokenUsageService, _estimate_cost
+from argus_agent.storage.token_usage import (
+    TokenUsageService,
+    _estimate_cost,
+    _format_bucket,
+    _model_rates,
+)
+
+# Plain rows in the shape of each query's labelled columns
+BucketRow = namedtuple(
+    "BucketRow", "bucket prompt_tokens completion_tokens total_tokens request_count"
+)
+DimensionRow = namedtuple(
+    "DimensionRow", "name prompt_tokens completion_tokens total_tokens request_count"
+)
+SummaryRow = namedtuple("SummaryRow", "model prompt completion requests today week month")
+
+
+class _Result(list):
+    """A query result: iterable, and answers ``.all()``."""
+
+    def all(self) -> list:
+        return list(self)
+
+
+@contextmanager
+def _mock_session(*rows):
+    """Patch ``get_session`` with a session whose ``execute`` returns *rows*."""
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=_Result(rows))
+    with patch("argus_agent.storage.token_usage.get_session") as mock_get:
+        mock_get.return_value.__aenter__ = AsyncMock(return_value=session)
+        mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
+        yield session
 
 
 class TestEstimateCost:
@@ -32,6 +67,13 @@ class TestEstimateCost:
         expected = (10000 / 1000) * 0.003 + (5000 / 1000) * 0.015
         assert abs(cost - expected) < 1e-10
 
+    def test_prefix_match_prefers_longest_key(self):
+        # "gpt-4o-mini-2024-07-18" also starts with "gpt-4o" and "gpt-4"
+        _model_rates.cache_clear()
+        assert _model_rates("gpt-4o-mini-2024-07-18") == (0.00015, 0.0006)
+        _estimate_cost("gpt-4o-mini-2024-07-18", 1, 1)
+        assert _model_rates.cache_info().hits == 1
+
 
 class TestTokenUsageServiceRecord:
     def setup_method(self):
@@ -39,14 +81,8 @@ class TestTokenUsageServiceRecord:
 
     @pytest.mark.asyncio
     async def test_record_inserts_row(self):
-        mock_session = AsyncMock()
-        mock_session.flush = AsyncMock()
-        mock_session.commit = AsyncMock()
-        mock_session.add = MagicMock(side_effect=lambda e: setattr(e, "id", 7))
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
+        with _mock_session() as mock_session:
+            mock_session.add = MagicMock(side_effect=lambda e: setattr(e, "id", 7))
 
             row_id = await self.svc.record(
                 prompt_tokens=100,
@@ -72,43 +108,47 @@ class TestTokenUsageServiceGetUsageOverTime:
 
     @pytest.mark.asyncio
     async def test_returns_aggregated_buckets(self):
-        mock_row = MagicMock()
-        mock_row.bucket = "2024-01-01 10:00"
-        mock_row.prompt_tokens = 500
-        mock_row.completion_tokens = 200
-        mock_row.total_tokens = 700
-        mock_row.request_count = 3
-
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(return_value=iter([mock_row]))
-
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _mock_session(BucketRow("2024-01-01 10:00", 500, 200, 700, 3)):
             data = await self.svc.get_usage_over_time(granularity="hour")
-            assert len(data) == 1
-            assert data[0]["bucket"] == "2024-01-01 10:00"
-            assert data[0]["total_tokens"] == 700
-            assert data[0]["request_count"] == 3
+        assert len(data) == 1
+        assert data[0]["bucket"] == "2024-01-01 10:00"
+        assert data[0]["total_tokens"] == 700
+        assert data[0]["request_count"] == 3
 
     @pytest.mark.asyncio
     async def test_empty_result(self):
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(return_value=iter([]))
+        with _mock_session():
+            data = await self.svc.get_usage_over_time(granularity="day")
+        assert data == []
 
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock(return_value=mock_result)
+    @pytest.mark.asyncio
+    async def test_postgres_buckets_formatted_after_grouping(self):
+        with (
+            patch("argus_agent.storage.token_usage._is_postgres", return_value=True),
+            _mock_session(BucketRow(datetime(2024, 1, 1, 10), 500, 200, 700, 3)) as session,
+        ):
+            data = await self.svc.get_usage_over_time(granularity="hour")
 
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
+        stmt = session.execute.await_args[0][0]
+        assert "date_trunc" in str(stmt)
+        assert data[0]["bucket"] == "2024-01-01 10:00"
 
-            data = await self.svc.get_usage_over_time(granularity="day")
-            assert data == []
+
+class TestFormatBucket:
+    @pytest.mark.parametrize(
+        ("granularity", "expected"),
+        [
+            ("hour", "2024-12-30 10:00"),
+            ("day", "2024-12-30"),
+            ("week", "2025-01"),  # ISO week, as to_char's IYYY-IW
+            ("month", "2024-12"),
+        ],
+    )
+    def test_truncated_timestamp(self, granularity, expected):
+        assert _format_bucket(datetime(2024, 12, 30, 10), granularity) == expected
+
+    def test_sqlite_label_passes_through(self):
+        assert _format_bucket("2024-01-01 10:00", "hour") == "2024-01-01 10:00"
 
 
 class TestTokenUsageServiceGetUsageByDimension:
@@ -118,48 +158,20 @@ class TestTokenUsageServiceGetUsageByDimension:
     @pytest.mark.asyncio
     async def test_group_by_provider(self):
         rows = [
-            MagicMock(
-                prompt_tokens=1000, completion_tokens=500,
-                total_tokens=1500, request_count=5,
-            ),
-            MagicMock(
-                prompt_tokens=800, completion_tokens=300,
-                total_tokens=1100, request_count=3,
-            ),
+            DimensionRow("openai", 1000, 500, 1500, 5),
+            DimensionRow("anthropic", 800, 300, 1100, 3),
         ]
-        # MagicMock's 'name' attribute is special, set it manually
-        rows[0].name = "openai"
-        rows[1].name = "anthropic"
-
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(return_value=iter(rows))
-
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _mock_session(*rows):
             data = await self.svc.get_usage_by_dimension(dimension="provider")
-            assert len(data) == 2
-            assert data[0]["name"] == "openai"
-            assert data[1]["name"] == "anthropic"
+        assert len(data) == 2
+        assert data[0]["name"] == "openai"
+        assert data[1]["name"] == "anthropic"
 
     @pytest.mark.asyncio
     async def test_empty_dimension(self):
-        mock_result = MagicMock()
-        mock_result.__iter__ = MagicMock(return_value=iter([]))
-
-        mock_session = AsyncMock()
-        mock_session.execute = AsyncMock(return_value=mock_result)
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _mock_session():
             data = await self.svc.get_usage_by_dimension(dimension="source")
-            assert data == []
+        assert data == []
 
 
 class TestTokenUsageServiceGetSummary:
@@ -168,99 +180,58 @@ class TestTokenUsageServiceGetSummary:
 
     @pytest.mark.asyncio
     async def test_summary_with_data(self):
-        # Row for all-time aggregation
-        all_row = MagicMock()
-        all_row.prompt = 5000
-        all_row.completion = 2000
-        all_row.total = 7000
-        all_row.requests = 10
-
-        # Scalar returns for today/week/month
-        today_scalar = 1500
-        week_scalar = 4000
-        month_scalar = 7000
-
-        # Cost rows
-        cost_row = MagicMock()
-        cost_row.model = "gpt-4o"
-        cost_row.prompt = 5000
-        cost_row.completion = 2000
-
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            result = MagicMock()
-            if call_count == 1:  # all-time
-                result.one.return_value = all_row
-                return result
-            elif call_count == 2:  # today
-                result.scalar.return_value = today_scalar
-                return result
-            elif call_count == 3:  # week
-                result.scalar.return_value = week_scalar
-                return result
-            elif call_count == 4:  # month
-                result.scalar.return_value = month_scalar
-                return result
-            elif call_count == 5:  # cost
-                result.all.return_value = [cost_row]
-                return result
-            return result
-
-        mock_session = AsyncMock()
-        mock_session.execute = mock_execute
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        # One row per model, each carrying every window's sums
+        rows = [
+            SummaryRow("gpt-4o", 4000, 1500, 8, today=1000, week=3000, month=5500),
+            SummaryRow("claude-sonnet-4-5", 1000, 500, 2, today=500, week=1000, month=1500),
+        ]
+        with _mock_session(*rows) as mock_session:
             summary = await self.svc.get_summary()
-            assert summary["total_tokens"] == 7000
-            assert summary["total_requests"] == 10
-            assert summary["prompt_tokens"] == 5000
-            assert summary["completion_tokens"] == 2000
-            assert summary["avg_tokens_per_request"] == 700
-            assert summary["today_tokens"] == 1500
-            assert summary["this_week_tokens"] == 4000
-            assert summary["this_month_tokens"] == 7000
-            assert summary["estimated_cost_usd"] > 0
+
+        assert mock_session.execute.await_count == 1
+        assert summary["total_tokens"] == 7000
+        assert summary["total_requests"] == 10
+        assert summary["prompt_tokens"] == 5000
+        assert summary["completion_tokens"] == 2000
+        assert summary["avg_tokens_per_request"] == 700
+        assert summary["today_tokens"] == 1500
+        assert summary["this_week_tokens"] == 4000
+        assert summary["this_month_tokens"] == 7000
+        assert summary["estimated_cost_usd"] == round(
+            _estimate_cost("gpt-4o", 4000, 1500) + _estimate_cost("claude-sonnet-4-5", 1000, 500),
+            4,
+        )
 
     @pytest.mark.asyncio
     async def test_summary_empty_db(self):
-        all_row = MagicMock()
-        all_row.prompt = 0
-        all_row.completion = 0
-        all_row.total = 0
-        all_row.requests = 0
-
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            result = MagicMock()
-            if call_count == 1:
-                result.one.return_value = all_row
-                return result
-            elif call_count in (2, 3, 4):
-                result.scalar.return_value = 0
-                return result
-            elif call_count == 5:
-                result.all.return_value = []
-                return result
-            return result
-
-        mock_session = AsyncMock()
-        mock_session.execute = mock_execute
-
-        with patch("argus_agent.storage.token_usage.get_session") as mock_get:
-            mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_session)
-            mock_get.return_value.__aexit__ = AsyncMock(return_value=False)
-
+        with _mock_session():
             summary = await self.svc.get_summary()
-            assert summary["total_tokens"] == 0
-            assert summary["total_requests"] == 0
-            assert summary["avg_tokens_per_request"] == 0
-            assert summary["estimated_cost_usd"] == 0
+
+        assert summary["total_tokens"] == 0
+        assert summary["total_requests"] == 0
+        assert summary["avg_tokens_per_request"] == 0
+        assert summary["estimated_cost_usd"] == 0
+        assert summary["today_tokens"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("_init_db")
+    async def test_summary_windows_on_sqlite(self):
+        from argus_agent.storage.database import get_session
+        from argus_agent.storage.models import TokenUsage
+
+        now = datetime.now(UTC).replace(tzinfo=None)
+        async with get_session() as session:
+            session.add_all([
+                TokenUsage(provider="openai", model="gpt-4o", prompt_tokens=100,
+                           completion_tokens=50, timestamp=now),
+                TokenUsage(provider="openai", model="gpt-4o", prompt_tokens=200,
+                           completion_tokens=100, timestamp=now - timedelta(days=400)),
+            ])
+            await session.commit()
+
+        summary = await self.svc.get_summary()
+        assert summary["total_tokens"] == 450
+        assert summary["total_requests"] == 2
+        assert summary["today_tokens"] == 150
+        assert summary["this_week_tokens"] == 150
+        assert summary["this_month_tokens"] == 150
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -10,6 +11,12 @@ from argus_agent.webhooks.tool_router import HOST_TOOLS, execute_tool
 
 _MOD = "argus_agent.webhooks.tool_router"
 
+_WEBHOOK = {
+    "url": "https://example.com/argus/webhook",
+    "secret": "secret123",
+    "timeout_seconds": 30,
+}
+
 
 @pytest.mark.asyncio
 async def test_returns_none_when_not_saas():
@@ -27,77 +34,54 @@ async def test_returns_none_for_non_host_tool():
         assert result is None
 
 
+@pytest.fixture
+def routed_webhook(monkeypatch):
+    """SaaS mode with ``_get_active_webhook`` and ``dispatch_tool_call`` mocked.
+
+    Returns ``(get_webhook, dispatch)``; the webhook lookup yields
+    ``_WEBHOOK`` unless the test overrides its ``return_value``.
+    """
+    get_webhook = AsyncMock(return_value=_WEBHOOK)
+    dispatch = AsyncMock()
+    monkeypatch.setattr(f"{_MOD}._is_saas", lambda: True)
+    monkeypatch.setattr(f"{_MOD}._get_active_webhook", get_webhook)
+    monkeypatch.setattr(f"{_MOD}.dispatch_tool_call", dispatch)
+    return get_webhook, dispatch
+
+
 @pytest.mark.asyncio
-async def test_returns_none_when_no_webhook_configured():
+async def test_returns_none_when_no_webhook_configured(routed_webhook):
     """If no active webhook exists, returns None for local fallback."""
-    with (
-        patch(f"{_MOD}._is_saas", return_value=True),
-        patch(
-            f"{_MOD}._get_active_webhook",
-            new_callable=AsyncMock,
-            return_value=None,
-        ),
-    ):
-        result = await execute_tool("system_metrics", {}, "tenant1")
-        assert result is None
+    get_webhook, dispatch = routed_webhook
+    get_webhook.return_value = None
+
+    result = await execute_tool("system_metrics", {}, "tenant1")
+    assert result is None
+    dispatch.assert_not_awaited()
 
 
 @pytest.mark.asyncio
-async def test_dispatches_to_webhook_when_configured():
+async def test_dispatches_to_webhook_when_configured(routed_webhook):
     """When a webhook is configured, the call is dispatched remotely."""
-    mock_webhook = {
-        "url": "https://example.com/argus/webhook",
-        "secret": "secret123",
-        "timeout_seconds": 30,
-    }
-    mock_resp = {"result": {"cpu_percent": 42.0}, "error": None}
-
-    with (
-        patch(f"{_MOD}._is_saas", return_value=True),
-        patch(
-            f"{_MOD}._get_active_webhook",
-            new_callable=AsyncMock,
-            return_value=mock_webhook,
-        ),
-        patch(
-            f"{_MOD}.dispatch_tool_call",
-            new_callable=AsyncMock,
-            return_value=mock_resp,
-        ),
-    ):
-        result = await execute_tool("system_metrics", {}, "tenant1")
-        assert result == {"cpu_percent": 42.0}
+    _, dispatch = routed_webhook
+    dispatch.return_value = {"result": {"cpu_percent": 42.0}, "error": None}
+
+    result = await execute_tool("system_metrics", {}, "tenant1")
+    assert result == {"cpu_percent": 42.0}
 
 
 @pytest.mark.asyncio
-async def test_returns_error_from_webhook():
+async def test_returns_error_from_webhook(routed_webhook):
     """When the webhook returns an error, it should be passed through."""
-    mock_webhook = {
-        "url": "https://example.com/argus/webhook",
-        "secret": "secret123",
-        "timeout_seconds": 30,
-    }
-    mock_resp = {
+    _, dispatch = routed_webhook
+    dispatch.return_value = {
         "error": "Webhook timed out after 30s",
         "result": None,
     }
 
-    with (
-        patch(f"{_MOD}._is_saas", return_value=True),
-        patch(
-            f"{_MOD}._get_active_webhook",
-            new_callable=AsyncMock,
-            return_value=mock_webhook,
-        ),
-        patch(
-            f"{_MOD}.dispatch_tool_call",
-            new_callable=AsyncMock,
-            return_value=mock_resp,
-        ),
-    ):
-        result = await execute_tool("system_metrics", {}, "tenant1")
-        assert result is not None
-        assert "error" in result
+    result = await execute_tool("system_metrics", {}, "tenant1")
+    assert result is not None
+    assert "error" in result
 
 
 def test_host_tools_set_contains_expected():
@@ -110,28 +94,16 @@ def test_host_tools_set_contains_expected():
 
 
 @pytest.mark.asyncio
-async def test_all_host_tools_are_routable():
+async def test_all_host_tools_are_routable(routed_webhook):
     """Every HOST_TOOL should be routable when webhook is configured."""
-    mock_webhook = {
-        "url": "https://example.com/argus/webhook",
-        "secret": "secret123",
-        "timeout_seconds": 30,
-    }
-    mock_resp = {"result": {"ok": True}, "error": None}
-
-    for tool_name in HOST_TOOLS:
-        with (
-            patch(f"{_MOD}._is_saas", return_value=True),
-            patch(
-                f"{_MOD}._get_active_webhook",
-                new_callable=AsyncMock,
-                return_value=mock_webhook,
-            ),
-            patch(
-                f"{_MOD}.dispatch_tool_call",
-                new_callable=AsyncMock,
-                return_value=mock_resp,
-            ),
-        ):
-            result = await execute_tool(tool_name, {}, "tenant1")
-            assert result is not None, f"{tool_name} not routed"
+    _, dispatch = routed_webhook
+    dispatch.return_value = {"result": {"ok": True}, "error": None}
+
+    tools = sorted(HOST_TOOLS)
+    results = await asyncio.gather(
+        *(execute_tool(tool_name, {}, "tenant1") for tool_name in tools)
+    )
+
+    for tool_name, result in zip(tools, results, strict=True):
+        assert result is not None, f"{tool_name} not routed"
+    assert dispatch.await_count == len(tools)
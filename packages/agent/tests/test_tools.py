@@ -5,7 +5,14 @@ from __future__ import annotations
 import pytest
 
 from argus_agent.config import reset_settings
-from argus_agent.tools.log_search import FileReadTool, LogSearchTool, LogTailTool
+from argus_agent.tools import log_search
+from argus_agent.tools.log_search import (
+    FileReadTool,
+    LogSearchTool,
+    LogTailTool,
+    _line_matcher,
+    _read_tail,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -15,9 +22,10 @@ def _reset():
     reset_settings()
 
 
-@pytest.fixture
-def sample_log(tmp_path):
-    log_file = tmp_path / "test.log"
+# The sample files are only ever read, so each is written once per module
+@pytest.fixture(scope="module")
+def sample_log(tmp_path_factory):
+    log_file = tmp_path_factory.mktemp("logs") / "test.log"
     log_file.write_text(
         "2024-01-01 INFO Starting application\n"
         "2024-01-01 INFO Connected to database\n"
@@ -31,9 +39,9 @@ def sample_log(tmp_path):
     return str(log_file)
 
 
-@pytest.fixture
-def sample_config(tmp_path):
-    config_file = tmp_path / "app.conf"
+@pytest.fixture(scope="module")
+def sample_config(tmp_path_factory):
+    config_file = tmp_path_factory.mktemp("config") / "app.conf"
     config_file.write_text(
         "[server]\nhost = 0.0.0.0\nport = 8080\n\n[database]\nurl = postgres://localhost/mydb\n"
     )
@@ -54,6 +62,31 @@ class TestLogSearch:
         result = await tool.execute(pattern=r"connect\w+", file=sample_log, case_insensitive=True)
         assert result["total_matches"] >= 2
 
+    @pytest.mark.asyncio
+    async def test_search_literal_case_sensitive(self, sample_log):
+        tool = LogSearchTool()
+        result = await tool.execute(
+            pattern="Connection refused: redis", file=sample_log, case_insensitive=False
+        )
+        assert result["total_matches"] == 1
+        result = await tool.execute(
+            pattern="connection refused", file=sample_log, case_insensitive=False
+        )
+        assert result["total_matches"] == 0
+
+    @pytest.mark.asyncio
+    async def test_search_literal_no_match(self, sample_log):
+        tool = LogSearchTool()
+        result = await tool.execute(pattern="segfault", file=sample_log)
+        assert result["total_matches"] == 0
+        assert result["matches"] == []
+
+    def test_line_matcher_only_skips_regex_for_plain_strings(self):
+        assert _line_matcher("redis:6379", False)("x redis:6379 y")
+        # "." is a metacharacter, so this stays a regex rather than a substring
+        assert _line_matcher("redis.6379", False)("redis:6379")
+        assert _line_matcher("REDIS", True)("redis")
+
     @pytest.mark.asyncio
     async def test_search_with_context(self, sample_log):
         tool = LogSearchTool()
@@ -97,6 +130,42 @@ class TestLogTail:
         assert result["returned"] == 3
         assert "Ready" in result["lines"][-1]["text"]
 
+    @pytest.mark.parametrize("block_size", [1, 3, 64 * 1024])
+    @pytest.mark.parametrize(
+        "content",
+        [
+            b"",
+            b"one",
+            b"one\n",
+            b"a\nb\nc",
+            b"a\r\nb\r\nc\r\n",
+            b"a\rb\rc\r",
+            b"\n\nx\n\n",
+            b"caf\xc3\xa9\nna\xc3\xafve\n",
+            "a\x0bb\x0cc\nd\x1ce\u2028f\x85g\ni\nj\n".encode(),
+        ],
+    )
+    @pytest.mark.parametrize("num_lines", [2, 50])
+    def test_read_tail_matches_full_read(
+        self, tmp_path, monkeypatch, block_size, content, num_lines
+    ):
+        monkeypatch.setattr(log_search, "_TAIL_BLOCK_SIZE", block_size)
+        path = tmp_path / "t.log"
+        path.write_bytes(content)
+
+        all_lines = content.decode().splitlines()
+        tail, total = _read_tail(path, num_lines)
+        assert tail == all_lines[-num_lines:]
+        assert total in (len(all_lines), None)
+
+    def test_read_tail_total_unknown_past_tail(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(log_search, "_TAIL_BLOCK_SIZE", 16)
+        path = tmp_path / "t.log"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+
+        assert _read_tail(path, 2) == (["line 98", "line 99"], None)
+        assert _read_tail(path, 200)[1] == 100
+
     @pytest.mark.asyncio
     async def test_tail_file_not_found(self):
         tool = LogTailTool()
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
+import hmac
 import time
+import uuid
 
+from argus_agent.webhooks import signing
 from argus_agent.webhooks.signing import sign_payload, verify_signature
 
 SECRET = "test-secret-key-abc123"
@@ -111,3 +115,74 @@ def test_sign_different_nonces_each_call():
     h1 = sign_payload(b"same", SECRET)
     h2 = sign_payload(b"same", SECRET)
     assert h1["X-Argus-Nonce"] != h2["X-Argus-Nonce"]
+
+
+def test_signature_matches_plain_hmac():
+    """The cached keyed HMAC must produce the same digest as a fresh hmac.new()."""
+    payload = b'{"n":1}'
+    for secret in (SECRET, "other-secret", SECRET):
+        headers = sign_payload(payload, secret)
+        message = f"{headers['X-Argus-Timestamp']}.{headers['X-Argus-Nonce']}.".encode() + payload
+        expected = hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+        assert headers["X-Argus-Signature"] == f"sha256={expected}"
+
+
+def _verify(payload: bytes, headers: dict[str, str], secret: str = SECRET) -> bool:
+    return verify_signature(
+        payload=payload,
+        secret=secret,
+        signature=headers["X-Argus-Signature"],
+        timestamp=headers["X-Argus-Timestamp"],
+        nonce=headers["X-Argus-Nonce"],
+    )
+
+
+def test_verify_rejects_replayed_nonce():
+    payload = b'{"hello":"world"}'
+    headers = sign_payload(payload, SECRET)
+    assert _verify(payload, headers)
+    assert not _verify(payload, headers)
+
+
+def test_nonce_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(signing, "_NONCE_CACHE_SIZE", 3)
+    monkeypatch.setattr(signing, "_seen_nonces", signing.OrderedDict())
+    for _ in range(5):
+        payload = b"{}"
+        assert _verify(payload, sign_payload(payload, SECRET))
+    assert len(signing._seen_nonces) == 3
+
+
+def test_same_nonce_under_different_secrets_is_not_a_replay(monkeypatch):
+    monkeypatch.setattr(signing, "_seen_nonces", signing.OrderedDict())
+    monkeypatch.setattr(signing.uuid, "uuid4", lambda: uuid.UUID(int=42))
+    payload = b"{}"
+    first = sign_payload(payload, SECRET)
+    second = sign_payload(payload, "other-secret")
+    assert first["X-Argus-Nonce"] == second["X-Argus-Nonce"]
+    assert _verify(payload, first)
+    assert _verify(payload, second, secret="other-secret")
+
+
+def test_nonce_expiry_ignores_sender_timestamp_order(monkeypatch):
+    monkeypatch.setattr(signing, "_seen_nonces", signing.OrderedDict())
+    now = 1_700_000_000.0
+    monkeypatch.setattr(signing.time, "time", lambda: now)
+
+    def signed_at(ts: int) -> tuple[bytes, dict[str, str]]:
+        monkeypatch.setattr(signing.time, "time", lambda: ts)
+        headers = sign_payload(b"{}", SECRET)
+        monkeypatch.setattr(signing.time, "time", lambda: now)
+        return b"{}", headers
+
+    # Sender clocks disagree: timestamps arrive newest, then oldest
+    ahead = signed_at(int(now) + 200)
+    behind = signed_at(int(now) - 200)
+    assert _verify(*ahead)
+    assert _verify(*behind)
+    assert not _verify(*behind)
+
+    # Once both are out of any replay window, neither lingers in the cache
+    now += 2 * 300 + 1
+    assert _verify(*signed_at(int(now)))
+    assert len(signing._seen_nonces) == 1
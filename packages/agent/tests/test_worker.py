@@ -6,20 +6,12 @@ import asyncio
 import json
 
 import pytest
-from fakeredis import aioredis as fakeredis_aioredis
 
 from argus_agent.api.protocol import ServerMessage, ServerMessageType
 from argus_agent.queue.task_queue import STREAM_KEY_PREFIX, TaskPayload, TaskQueue, TaskStatus
 from argus_agent.queue.worker import RedisWSAdapter
 
 
-@pytest.fixture
-async def redis():
-    r = fakeredis_aioredis.FakeRedis(decode_responses=True)
-    yield r
-    await r.aclose()
-
-
 class TestRedisWSAdapter:
     @pytest.mark.asyncio
     async def test_broadcast_publishes_to_stream(self, redis):
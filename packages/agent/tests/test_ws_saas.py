@@ -6,7 +6,6 @@ import asyncio
 import json
 
 import pytest
-from fakeredis import aioredis as fakeredis_aioredis
 
 from argus_agent.api.protocol import ServerMessage, ServerMessageType
 from argus_agent.queue.task_queue import (
@@ -18,13 +17,6 @@ from argus_agent.queue.task_queue import (
 )
 
 
-@pytest.fixture
-async def redis():
-    r = fakeredis_aioredis.FakeRedis(decode_responses=True)
-    yield r
-    await r.aclose()
-
-
 @pytest.fixture
 def queue(redis):
     return TaskQueue(redis)